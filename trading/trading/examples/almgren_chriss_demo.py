@@ -10,7 +10,6 @@ This script demonstrates:
 import sys
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import Dict, List, Tuple
 
 # Add the project root to the Python path
@@ -52,11 +51,11 @@ def demo_market_impact():
     print(f"Order Size: {order_size} units")
     print(f"Mid Price: ${mid_price:.2f}")
     print(f"Execution Time: {execution_time} hours")
-    print(f"Temporary Impact: ${impact['temporary_impact']:.4f}")
-    print(f"Permanent Impact: ${impact['permanent_impact']:.4f}")
-    print(f"Execution Risk: ${impact['execution_risk']:.4f}")
-    print(f"Total Impact: ${impact['total_impact']:.4f}")
-    print(f"Impact as % of order value: {100 * impact['total_impact'] / (order_size * mid_price):.4f}%")
+    print(f"Temporary Impact: ${impact.temporary_impact:.4f}")
+    print(f"Permanent Impact: ${impact.permanent_impact:.4f}")
+    print(f"Execution Risk: ${impact.execution_risk:.4f}")
+    print(f"Total Impact: ${impact.total_impact:.4f}")
+    print(f"Impact as % of order value: {100 * impact.total_impact / (order_size * mid_price):.4f}%")
 
 
 def demo_optimal_execution():
@@ -147,7 +146,8 @@ def demo_visualization():
     )
     
     # Show all figures
-    plt.show()
+    for fig in (fig1, fig2, fig3):
+        fig.show()
 
 
 def demo_risk_sensitivity():
@@ -176,12 +176,13 @@ def demo_risk_sensitivity():
     print("Volatility | Execution Risk ($)")
     print("-" * 30)
     
-    for vol in volatilities:
-        # Calculate market impact with different volatilities
-        impact = model.calculate_market_impact(
-            total_size, 10000, vol, 100.0, 5000, time_horizon
-        )
-        print(f"{vol:.1f} | {impact['execution_risk']:.2f}")
+    # Calculate market impact for all volatilities in one batch
+    impacts = model.calculate_market_impact_batch(
+        total_size, 10000, np.array(volatilities), 100.0, 5000, time_horizon
+    )
+
+    for vol, execution_risk in zip(volatilities, impacts.execution_risk):
+        print(f"{vol:.1f} | {execution_risk:.2f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+"""
+Benchmark of orderbook updates on the WebSocket path.
+
+Times the work done per L2 snapshot, from the raw string levels to sorted
+levels:
+1. Orderbook: levels_to_array in the WebSocket client, then Orderbook.update
+   (which also computes the cumulative quantities)
+2. Lists: the earlier list-based path, float() on every field in the client
+   and again in the orderbook, then sorted() on [price, quantity] pairs
+
+Usage:
+    python examples/orderbook_benchmark.py
+"""
+
+import sys
+import os
+import random
+import time
+import timeit
+from typing import Dict
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.orderbook import Orderbook, levels_to_array
+
+DEPTHS = (5, 20, 50, 100, 400)
+MAX_DEPTH = 50
+
+
+def make_snapshot(n_levels: int) -> Dict:
+    """
+    Build a raw orderbook snapshot as received from OKX.
+
+    Args:
+        n_levels: Number of levels per side
+
+    Returns:
+        Dict: Snapshot with string prices and quantities, best level first
+    """
+    return {
+        'timestamp': '2025-05-04T10:39:13Z',
+        'exchange': 'OKX',
+        'symbol': 'BTC-USDT-SWAP',
+        'asks': [[f'{45000.5 + 0.5 * i:.1f}', f'{random.uniform(0.1, 5.0):.4f}'] for i in range(n_levels)],
+        'bids': [[f'{44999.5 - 0.5 * i:.1f}', f'{random.uniform(0.1, 5.0):.4f}'] for i in range(n_levels)]
+    }
+
+
+def orderbook_update(orderbook: Orderbook, data: Dict):
+    """
+    Parse a snapshot as the WebSocket client does and update the orderbook.
+
+    Args:
+        orderbook: Orderbook to update
+        data: Raw snapshot
+    """
+    orderbook.update({
+        'timestamp': data['timestamp'],
+        'exchange': data['exchange'],
+        'symbol': data['symbol'],
+        'asks': levels_to_array(data['asks']),
+        'bids': levels_to_array(data['bids'])
+    })
+
+
+class ListOrderbook:
+    """
+    Reference orderbook on Python lists, as the orderbook was before it moved to arrays.
+    """
+    def __init__(self, max_depth: int = 50):
+        """
+        Initialize the orderbook.
+
+        Args:
+            max_depth: Maximum number of price levels to maintain
+        """
+        self.max_depth = max_depth
+        self.asks = []
+        self.bids = []
+        self.processing_times = []
+
+    def update(self, data: Dict) -> float:
+        """
+        Update the orderbook with new data.
+
+        Args:
+            data: Orderbook data with asks and bids
+
+        Returns:
+            float: Processing time in milliseconds
+        """
+        start_time = time.time()
+
+        asks = [[float(price), float(qty)] for price, qty in data.get('asks', [])]
+        bids = [[float(price), float(qty)] for price, qty in data.get('bids', [])]
+
+        self.asks = sorted(asks, key=lambda x: x[0])[:self.max_depth]
+        self.bids = sorted(bids, key=lambda x: x[0], reverse=True)[:self.max_depth]
+
+        processing_time = (time.time() - start_time) * 1000
+        self.processing_times.append(processing_time)
+        if len(self.processing_times) > 1000:
+            self.processing_times = self.processing_times[-1000:]
+
+        return processing_time
+
+
+def list_orderbook_update(orderbook: ListOrderbook, data: Dict):
+    """
+    Parse a snapshot as the WebSocket client did before and update the reference orderbook.
+
+    Args:
+        orderbook: Reference orderbook to update
+        data: Raw snapshot
+    """
+    orderbook.update({
+        'timestamp': data['timestamp'],
+        'exchange': data['exchange'],
+        'symbol': data['symbol'],
+        'asks': [[float(price), float(qty)] for price, qty in data['asks']],
+        'bids': [[float(price), float(qty)] for price, qty in data['bids']]
+    })
+
+
+def best_time_us(func, number: int = 2000, repeat: int = 7) -> float:
+    """
+    Time a function, taking the best of several runs.
+
+    Args:
+        func: Function to time
+        number: Calls per run
+        repeat: Number of runs
+
+    Returns:
+        float: Time per call in microseconds
+    """
+    func()  # Warm up (JIT compilation, allocations)
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+    """
+    random.seed(0)
+    print(f"\n=== Orderbook Update Benchmark (max_depth={MAX_DEPTH}) ===")
+    print(f"{'Levels':>8} {'Orderbook (us)':>16} {'Lists (us)':>12} {'Speedup':>8}")
+
+    for n_levels in DEPTHS:
+        data = make_snapshot(n_levels)
+        orderbook = Orderbook(max_depth=MAX_DEPTH)
+        list_orderbook = ListOrderbook(max_depth=MAX_DEPTH)
+
+        array_us = best_time_us(lambda: orderbook_update(orderbook, data))
+        list_us = best_time_us(lambda: list_orderbook_update(list_orderbook, data))
+
+        print(f"{n_levels:>8} {array_us:>16.1f} {list_us:>12.1f} {list_us / array_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
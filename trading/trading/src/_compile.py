@@ -0,0 +1,31 @@
+"""
+Ahead-of-time compilation of the orderbook kernels.
+
+Builds the @njit kernels from src/data/_ob_kernels.py into a native extension
+module, src/data/_ob_native, so the application starts without any JIT
+compilation. Run once after installing the requirements:
+
+    python src/_compile.py
+
+Orderbook falls back to the JIT kernels when the extension is not built.
+"""
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+
+from numba.pycc import CC
+
+from src.data import _ob_kernels
+
+cc = CC('_ob_native')
+cc.output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+cc.export('volume_at_price', 'f8(f8[::1], f8[::1], f8, b1)')(_ob_kernels.volume_at_price.py_func)
+cc.export('cum_vol_from_cum', 'f8(f8[::1], f8[::1], f8, b1)')(_ob_kernels.cum_vol_from_cum.py_func)
+cc.export('price_index_for_cum_volume', 'i8(f8[::1], f8)')(_ob_kernels.price_index_for_cum_volume.py_func)
+cc.export('sort_levels_into', 'i8(f8[:, :], f8[:, ::1], i8, b1)')(_ob_kernels.sort_levels_into.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,143 @@
+"""
+Numba-compiled sort and scan kernels for the orderbook price/quantity arrays.
+
+Signatures are given explicitly so the kernels are compiled when the module
+is imported (and cached on disk) rather than on the first orderbook tick.
+
+A kernel whose arguments change meaning gets a new name, so an extension
+built from older kernels by src/_compile.py is not picked up by mistake.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit('float64(float64[::1], float64[::1], float64, boolean)', cache=True, fastmath=True)
+def volume_at_price(px, qty, price, ascending):
+    """
+    Get the quantity resting at a price level using a binary search.
+
+    Args:
+        px: Level prices, sorted best-first
+        qty: Level quantities
+        price: Price level
+        ascending: True for asks (ascending prices), False for bids
+
+    Returns:
+        float: Quantity at the price, or 0.0 if the level is absent
+    """
+    # First level that is not strictly better than the price (within epsilon)
+    lo = 0
+    hi = px.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (ascending and px[mid] < price - 1e-8) or (not ascending and px[mid] > price + 1e-8):
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < px.shape[0] and abs(px[lo] - price) < 1e-8:
+        return qty[lo]
+    return 0.0
+
+
+@njit('float64(float64[::1], float64[::1], float64, boolean)', cache=True, fastmath=True)
+def cum_vol_from_cum(px, cum, price, ascending):
+    """
+    Get the quantity of the levels up to (and including) a price using a binary search.
+
+    Args:
+        px: Level prices, sorted best-first
+        cum: Cumulative level quantities
+        price: Price level
+        ascending: True for asks (ascending prices), False for bids
+
+    Returns:
+        float: Cumulative quantity
+    """
+    # Number of levels at or better than the price
+    lo = 0
+    hi = px.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (ascending and px[mid] <= price) or (not ascending and px[mid] >= price):
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == 0:
+        return 0.0
+    return cum[lo - 1]
+
+
+@njit('int64(float64[::1], float64)', cache=True, fastmath=True)
+def price_index_for_cum_volume(cum, volume):
+    """
+    Find the level at which a volume is completely filled using a binary search.
+
+    Args:
+        cum: Cumulative level quantities, sorted best-first
+        volume: Volume to fill
+
+    Returns:
+        int: Index of the filling level, or -1 if there is not enough volume
+    """
+    # First level whose cumulative quantity covers the volume
+    lo = 0
+    hi = cum.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cum[mid] < volume:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == cum.shape[0]:
+        return -1
+    return lo
+
+
+@njit('int64(float64[:, :], float64[:, ::1], int64, boolean)', cache=True)
+def sort_levels_into(levels, out, row, ascending):
+    """
+    Sort one side's levels best-first into consecutive rows of a buffer.
+
+    Writes prices, quantities and cumulative quantities into rows row,
+    row + 1 and row + 2, keeping at most as many levels as the buffer has
+    columns. Levels that arrive best-first (as exchange snapshots do) are
+    copied without sorting; otherwise a stable sort keeps equal-priced
+    levels in arrival order.
+
+    Args:
+        levels: (n, 2) array of [price, quantity] rows
+        out: Buffer to write into
+        row: First of the three rows to write
+        ascending: True for asks (ascending prices), False for bids
+
+    Returns:
+        int: Number of levels written
+    """
+    n = levels.shape[0]
+    depth = min(n, out.shape[1])
+
+    in_order = True
+    for i in range(1, n):
+        if (ascending and levels[i, 0] < levels[i - 1, 0]) or (not ascending and levels[i, 0] > levels[i - 1, 0]):
+            in_order = False
+            break
+
+    total = 0.0
+    if in_order:
+        for i in range(depth):
+            total += levels[i, 1]
+            out[row, i] = levels[i, 0]
+            out[row + 1, i] = levels[i, 1]
+            out[row + 2, i] = total
+        return depth
+
+    # Negate rather than reverse so equal-priced bids keep their arrival order
+    keys = levels[:, 0].copy() if ascending else -levels[:, 0]
+    order = np.argsort(keys, kind='mergesort')
+    for i in range(depth):
+        j = order[i]
+        total += levels[j, 1]
+        out[row, i] = levels[j, 0]
+        out[row + 1, i] = levels[j, 1]
+        out[row + 2, i] = total
+    return depth
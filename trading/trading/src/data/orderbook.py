@@ -2,22 +2,90 @@
 Orderbook data structure for processing and analyzing L2 market data.
 """
 import time
+from collections import deque
+from itertools import chain
+from operator import itemgetter
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+def _load_kernels() -> Tuple:
+    """
+    Load the orderbook kernels, preferring the ahead-of-time compiled extension.
+
+    The extension is built separately (src/_compile.py) and may predate the
+    current kernels. Kernels are looked up by name and renamed whenever their
+    arguments change meaning, so a stale extension falls back to JIT-compiling
+    the current kernels.
+
+    Returns:
+        Tuple: (volume_at_price, cum_vol_from_cum, price_index_for_cum_volume, sort_levels_into)
+    """
+    try:
+        from src.data import _ob_native as kernels
+        return (kernels.volume_at_price, kernels.cum_vol_from_cum, kernels.price_index_for_cum_volume,
+                kernels.sort_levels_into)
+    except (ImportError, AttributeError):
+        from src.data import _ob_kernels as kernels
+        return (kernels.volume_at_price, kernels.cum_vol_from_cum, kernels.price_index_for_cum_volume,
+                kernels.sort_levels_into)
+
+volume_at_price, cum_vol_from_cum, price_index_for_cum_volume, sort_levels_into = _load_kernels()
+
+_price_qty = itemgetter(0, 1)
+
+def levels_to_array(levels) -> np.ndarray:
+    """
+    Convert orderbook levels to an (n, 2) float64 array of [price, quantity].
+
+    Rows may carry extra fields after the price and quantity (e.g. OKX's
+    liquidated orders and order count); only the first two are kept.
+
+    Args:
+        levels: Levels as an array or a sequence of [price, quantity, ...] rows
+            (strings or numbers)
+
+    Returns:
+        np.ndarray: Levels array; float64 arrays are returned without a copy
+
+    Raises:
+        ValueError: If the rows have fewer than two fields or differing widths
+    """
+    if isinstance(levels, np.ndarray):
+        if levels.dtype == np.float64 and levels.ndim == 2 and levels.shape[1] == 2:
+            return levels
+        levels = np.asarray(levels, dtype=np.float64)
+        if levels.size == 0:
+            return levels.reshape(0, 2)
+        if levels.ndim != 2 or levels.shape[1] < 2:
+            raise ValueError(f"Expected levels of shape (n, 2) or wider, got {levels.shape}")
+        return levels[:, :2]
+
+    widths = set(map(len, levels))
+    if widths == {2}:
+        rows = levels
+    elif not widths:
+        return np.empty((0, 2), dtype=np.float64)
+    elif len(widths) > 1 or min(widths) < 2:
+        raise ValueError(f"Orderbook levels have invalid widths: {sorted(widths)}")
+    else:
+        rows = map(_price_qty, levels)
+    # Fill the array in a single C-level pass over the flattened pairs
+    return np.fromiter(chain.from_iterable(rows), dtype=np.float64,
+                       count=2 * len(levels)).reshape(-1, 2)
+
 class Orderbook:
     """
     Orderbook data structure for processing L2 market data.
     """
+    __slots__ = (
+        'max_depth', '_buffers', '_active', '_book', 'timestamp', 'exchange', 'symbol', 'processing_times',
+        'version', '_mid_cache', '_spread_cache'
+    )
+
     def __init__(self, max_depth: int = 50):
         """
         Initialize the orderbook.
@@ -26,13 +94,31 @@ class Orderbook:
             max_depth: Maximum number of price levels to maintain
         """
         self.max_depth = max_depth
-        self.asks = []  # List of [price, quantity] pairs
-        self.bids = []  # List of [price, quantity] pairs
+        # Level storage is allocated once: rows are ask prices, quantities and
+        # cumulative quantities, then the same for bids. Updates alternate
+        # between two buffers so views handed out for the previous update are
+        # not overwritten mid-read.
+        self._buffers = (
+            np.empty((6, max_depth), dtype=np.float64),
+            np.empty((6, max_depth), dtype=np.float64)
+        )
+        self._active = 0
+        # The current levels: (ask_px, ask_qty, ask_cum, bid_px, bid_qty, bid_cum,
+        # ask_volume, bid_volume). Asks ascend and bids descend from the best
+        # level; the cumulative quantities back the binary-search lookups.
+        # Updates run on the WebSocket worker thread while dashboard threads
+        # read, so an update publishes all of them in one assignment and
+        # readers take the tuple once per call.
+        empty = self._buffers[0][:, :0]
+        self._book = (empty[0], empty[1], empty[2], empty[3], empty[4], empty[5], 0.0, 0.0)
         self.timestamp = None
         self.exchange = None
         self.symbol = None
-        self.last_update_time = 0
-        self.processing_times = []  # Track processing times for performance metrics
+        self.processing_times = deque(maxlen=1000)  # Last 1000 processing times (ns) for performance metrics
+        # Incremented by every update; derived values are cached as (version, value)
+        self.version = 0
+        self._mid_cache = (-1, None)
+        self._spread_cache = (-1, None)
 
     def update(self, data: Dict) -> float:
         """
@@ -44,29 +130,114 @@ class Orderbook:
         Returns:
             float: Processing time in milliseconds
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         self.timestamp = data.get('timestamp')
         self.exchange = data.get('exchange')
         self.symbol = data.get('symbol')
 
-        # Convert string prices and quantities to float
-        asks = [[float(price), float(qty)] for price, qty in data.get('asks', [])]
-        bids = [[float(price), float(qty)] for price, qty in data.get('bids', [])]
+        # Parse prices and quantities; float64 arrays from the WebSocket
+        # client pass through without a copy
+        asks = levels_to_array(data.get('asks', []))
+        bids = levels_to_array(data.get('bids', []))
+
+        # Sort the best levels and their cumulative quantities straight into
+        # the inactive buffer: asks ascending, bids descending
+        self._active ^= 1
+        buf = self._buffers[self._active]
+        n_asks = sort_levels_into(asks, buf, 0, True)
+        n_bids = sort_levels_into(bids, buf, 3, False)
+
+        self._book = (buf[0, :n_asks], buf[1, :n_asks], buf[2, :n_asks],
+                      buf[3, :n_bids], buf[4, :n_bids], buf[5, :n_bids],
+                      float(buf[2, n_asks - 1]) if n_asks else 0.0,
+                      float(buf[5, n_bids - 1]) if n_bids else 0.0)
+        self.version += 1
+
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        self.processing_times.append(elapsed_ns)
+
+        return elapsed_ns / 1e6  # Convert to ms
+
+    @property
+    def ask_px(self) -> np.ndarray:
+        """
+        Ask prices, ascending.
+        """
+        return self._book[0]
+
+    @property
+    def ask_qty(self) -> np.ndarray:
+        """
+        Ask quantities.
+        """
+        return self._book[1]
+
+    @property
+    def ask_cum(self) -> np.ndarray:
+        """
+        Cumulative ask quantities from the best ask.
+        """
+        return self._book[2]
+
+    @property
+    def bid_px(self) -> np.ndarray:
+        """
+        Bid prices, descending.
+        """
+        return self._book[3]
+
+    @property
+    def bid_qty(self) -> np.ndarray:
+        """
+        Bid quantities.
+        """
+        return self._book[4]
+
+    @property
+    def bid_cum(self) -> np.ndarray:
+        """
+        Cumulative bid quantities from the best bid.
+        """
+        return self._book[5]
 
-        # Update asks and bids
-        self.asks = sorted(asks, key=lambda x: x[0])[:self.max_depth]
-        self.bids = sorted(bids, key=lambda x: x[0], reverse=True)[:self.max_depth]
+    @property
+    def ask_volume(self) -> float:
+        """
+        Total ask quantity.
+        """
+        return self._book[6]
 
-        self.last_update_time = time.time()
-        processing_time = (self.last_update_time - start_time) * 1000  # Convert to ms
-        self.processing_times.append(processing_time)
+    @property
+    def bid_volume(self) -> float:
+        """
+        Total bid quantity.
+        """
+        return self._book[7]
 
-        # Keep only the last 1000 processing times
-        if len(self.processing_times) > 1000:
-            self.processing_times = self.processing_times[-1000:]
+    @property
+    def depth(self) -> float:
+        """
+        Total quantity across both sides.
+        """
+        book = self._book
+        return book[6] + book[7]
+
+    @property
+    def asks(self) -> np.ndarray:
+        """
+        Ask levels as an (N, 2) array of [price, quantity] rows.
+        """
+        book = self._book
+        return np.column_stack((book[0], book[1]))
 
-        return processing_time
+    @property
+    def bids(self) -> np.ndarray:
+        """
+        Bid levels as an (N, 2) array of [price, quantity] rows.
+        """
+        book = self._book
+        return np.column_stack((book[3], book[4]))
 
     def get_mid_price(self) -> Optional[float]:
         """
@@ -75,12 +246,17 @@ class Orderbook:
         Returns:
             float: Mid price or None if orderbook is empty
         """
-        if not self.asks or not self.bids:
-            return None
-
-        best_ask = self.asks[0][0]
-        best_bid = self.bids[0][0]
-        return (best_ask + best_bid) / 2
+        # Read the version before the levels: update() publishes the levels
+        # first, so a value is never cached under a newer version than its data
+        version = self.version
+        cached_version, cached = self._mid_cache
+        if cached_version == version:
+            return cached
+
+        ask_px, _, _, bid_px = self._book[:4]
+        mid = None if ask_px.size == 0 or bid_px.size == 0 else (ask_px[0] + bid_px[0]) / 2
+        self._mid_cache = (version, mid)
+        return mid
 
     def get_spread(self) -> Optional[float]:
         """
@@ -89,12 +265,16 @@ class Orderbook:
         Returns:
             float: Spread or None if orderbook is empty
         """
-        if not self.asks or not self.bids:
-            return None
+        # Version before levels, as in get_mid_price
+        version = self.version
+        cached_version, cached = self._spread_cache
+        if cached_version == version:
+            return cached
 
-        best_ask = self.asks[0][0]
-        best_bid = self.bids[0][0]
-        return best_ask - best_bid
+        ask_px, _, _, bid_px = self._book[:4]
+        spread = None if ask_px.size == 0 or bid_px.size == 0 else ask_px[0] - bid_px[0]
+        self._spread_cache = (version, spread)
+        return spread
 
     def get_spread_percentage(self) -> Optional[float]:
         """
@@ -122,14 +302,11 @@ class Orderbook:
         Returns:
             float: Volume available at the price
         """
+        book = self._book
         if side.lower() == 'ask':
-            for p, q in self.asks:
-                if abs(p - price) < 1e-8:  # Compare with small epsilon for float comparison
-                    return q
+            return volume_at_price(book[0], book[1], price, True)
         elif side.lower() == 'bid':
-            for p, q in self.bids:
-                if abs(p - price) < 1e-8:
-                    return q
+            return volume_at_price(book[3], book[4], price, False)
         return 0.0
 
     def get_volume_up_to_price(self, side: str, price: float) -> float:
@@ -143,22 +320,12 @@ class Orderbook:
         Returns:
             float: Cumulative volume
         """
-        volume = 0.0
-
+        book = self._book
         if side.lower() == 'ask':
-            for p, q in self.asks:
-                if p <= price:
-                    volume += q
-                else:
-                    break
+            return cum_vol_from_cum(book[0], book[2], price, True)
         elif side.lower() == 'bid':
-            for p, q in self.bids:
-                if p >= price:
-                    volume += q
-                else:
-                    break
-
-        return volume
+            return cum_vol_from_cum(book[3], book[5], price, False)
+        return 0.0
 
     def get_price_for_volume(self, side: str, volume: float) -> Optional[float]:
         """
@@ -171,20 +338,19 @@ class Orderbook:
         Returns:
             float: Price needed or None if not enough volume
         """
-        remaining_volume = volume
-
+        book = self._book
         if side.lower() == 'ask':
-            for p, q in self.asks:
-                remaining_volume -= q
-                if remaining_volume <= 0:
-                    return p
+            px, cum = book[0], book[2]
         elif side.lower() == 'bid':
-            for p, q in self.bids:
-                remaining_volume -= q
-                if remaining_volume <= 0:
-                    return p
+            px, cum = book[3], book[5]
+        else:
+            return None
 
-        return None  # Not enough volume in the orderbook
+        idx = price_index_for_cum_volume(cum, volume)
+        if idx < 0:
+            return None  # Not enough volume in the orderbook
+
+        return px[idx]
 
     def get_orderbook_imbalance(self) -> Optional[float]:
         """
@@ -193,16 +359,15 @@ class Orderbook:
         Returns:
             float: Imbalance between -1 and 1, or None if orderbook is empty
         """
-        if not self.asks or not self.bids:
+        ask_px, _, _, bid_px, _, _, ask_volume, bid_volume = self._book
+        if ask_px.size == 0 or bid_px.size == 0:
             return None
 
-        bid_volume = sum(q for _, q in self.bids)
-        ask_volume = sum(q for _, q in self.asks)
-
-        if bid_volume + ask_volume == 0:
-            return 0
+        depth = ask_volume + bid_volume
+        if depth == 0:
+            return 0.0
 
-        return (bid_volume - ask_volume) / (bid_volume + ask_volume)
+        return (bid_volume - ask_volume) / depth
 
     def get_average_processing_time(self) -> float:
         """
@@ -214,7 +379,20 @@ class Orderbook:
         if not self.processing_times:
             return 0
 
-        return sum(self.processing_times) / len(self.processing_times)
+        return sum(self.processing_times) / len(self.processing_times) / 1e6  # Convert to ms
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the sorted orderbook levels as arrays, without copying.
+
+        The arrays are views into the orderbook buffers and are overwritten by
+        the second update after this call; copy them to keep them longer.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (ask_px, ask_qty, bid_px, bid_qty)
+        """
+        ask_px, ask_qty, _, bid_px, bid_qty = self._book[:5]
+        return ask_px, ask_qty, bid_px, bid_qty
 
     def to_dataframe(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -223,13 +401,16 @@ class Orderbook:
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame]: (asks_df, bids_df)
         """
-        asks_df = pd.DataFrame(self.asks, columns=['price', 'quantity'])
-        bids_df = pd.DataFrame(self.bids, columns=['price', 'quantity'])
-
-        # Add cumulative quantities
-        if not asks_df.empty:
-            asks_df['cumulative_quantity'] = asks_df['quantity'].cumsum()
-        if not bids_df.empty:
-            bids_df['cumulative_quantity'] = bids_df['quantity'].cumsum()
+        ask_px, ask_qty, ask_cum, bid_px, bid_qty, bid_cum = self._book[:6]
+        asks_df = pd.DataFrame({
+            'price': ask_px,
+            'quantity': ask_qty,
+            'cumulative_quantity': ask_cum
+        })
+        bids_df = pd.DataFrame({
+            'price': bid_px,
+            'quantity': bid_qty,
+            'cumulative_quantity': bid_cum
+        })
 
         return asks_df, bids_df
@@ -2,25 +2,36 @@
 WebSocket client for connecting to cryptocurrency exchange L2 orderbook data.
 """
 import asyncio
-import json
 import logging
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Callable, Optional, Any
 
 import websockets
-from websockets.exceptions import ConnectionClosed
+from websockets.exceptions import ConnectionClosed, ConnectionClosedOK
+from websockets.protocol import State
+
+from src.data.orderbook import levels_to_array
+
+# orjson parses both bytes and str frames natively; fall back to the stdlib parser
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class WebSocketClient:
     """
     Client for connecting to WebSocket endpoints and processing L2 orderbook data.
     """
+    __slots__ = (
+        'uri', 'callback', 'reconnect_interval', 'websocket', 'running', 'last_message_time',
+        'connection_attempts', 'max_connection_attempts', '_executor', 'max_pending_callbacks',
+        'max_queue_size'
+    )
+
     def __init__(self, uri: str, callback: Callable[[Dict], None], reconnect_interval: int = 5):
         """
         Initialize the WebSocket client.
@@ -38,6 +49,12 @@ class WebSocketClient:
         self.last_message_time = 0
         self.connection_attempts = 0
         self.max_connection_attempts = 10
+        # Callbacks run on a single worker thread (preserving message order) so the
+        # event loop can keep receiving while the previous message is processed
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ws-callback')
+        self.max_pending_callbacks = 64
+        # Received messages waiting to be parsed; receiving pauses while it is full
+        self.max_queue_size = 1024
         
     async def connect(self):
         """
@@ -56,16 +73,7 @@ class WebSocketClient:
                     self.connection_attempts = 0  # Reset counter on successful connection
                     logger.info(f"Connected to {self.uri}")
                     
-                    # Process messages
-                    async for message in websocket:
-                        self.last_message_time = time.time()
-                        try:
-                            data = json.loads(message)
-                            self.callback(data)
-                        except json.JSONDecodeError:
-                            logger.error(f"Failed to parse message: {message}")
-                        except Exception as e:
-                            logger.error(f"Error processing message: {e}")
+                    await self._receive(websocket)
                             
             except ConnectionClosed as e:
                 logger.warning(f"WebSocket connection closed: {e}")
@@ -80,6 +88,122 @@ class WebSocketClient:
             logger.error(f"Max connection attempts ({self.max_connection_attempts}) reached. Stopping reconnection.")
             self.running = False
     
+    async def _receive(self, websocket):
+        """
+        Receive from an open WebSocket until the stream ends.
+
+        A reader task queues raw messages while a consumer task parses and
+        dispatches them. If the consumer fails nothing drains the queue, so
+        the reader is cancelled rather than left waiting for space.
+
+        Args:
+            websocket: Open WebSocket connection
+
+        Raises:
+            Exception: The consumer's error, otherwise the reader's
+        """
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        reader = asyncio.create_task(self._read_messages(websocket, queue))
+        consumer = asyncio.create_task(self._process_messages(queue))
+        consumer.add_done_callback(lambda _: reader.cancel())
+
+        try:
+            await asyncio.wait((reader,))
+            if not consumer.done():
+                # End of stream: the consumer stops after the messages already queued
+                end = asyncio.create_task(self._enqueue(queue, None))
+                consumer.add_done_callback(lambda _: end.cancel())
+                await asyncio.wait((end,))
+            await asyncio.wait((consumer,))
+        finally:
+            # Only still running if connect() itself was cancelled
+            reader.cancel()
+            consumer.cancel()
+
+        consumer.result()
+        if not reader.cancelled():
+            reader.result()
+
+    async def _read_messages(self, websocket, queue: asyncio.Queue):
+        """
+        Receive raw messages from the WebSocket and queue them for processing.
+
+        Args:
+            websocket: Open WebSocket connection
+            queue: Queue of raw messages
+        """
+        try:
+            while True:
+                # Keep frames as bytes: the JSON parser reads them without UTF-8 decoding
+                message = await websocket.recv(decode=False)
+                self.last_message_time = time.time()
+                await self._enqueue(queue, message)
+        except ConnectionClosedOK:
+            pass
+
+    async def _enqueue(self, queue: asyncio.Queue, message):
+        """
+        Queue a message, waiting for space if the queue is full.
+
+        Messages are never dropped here; subclasses for self-contained
+        messages may override this with a dropping policy.
+
+        Args:
+            queue: Queue of raw messages
+            message: Raw message, or None to mark the end of the stream
+        """
+        await queue.put(message)
+
+    async def _process_messages(self, queue: asyncio.Queue):
+        """
+        Parse and dispatch queued messages until the stream ends.
+
+        Each wakeup drains every message that has already arrived, so bursts
+        are handled in one pass instead of one event loop iteration each.
+
+        Args:
+            queue: Queue of raw messages filled by _read_messages
+        """
+        loop = asyncio.get_running_loop()
+        pending = deque()
+
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                for message in batch:
+                    if message is None:
+                        return
+                    try:
+                        data = _json.loads(message)
+                    except ValueError:
+                        # Decode errors from either parser, including invalid UTF-8
+                        logger.error(f"Failed to parse message: {message}")
+                        continue
+                    pending.append(loop.run_in_executor(self._executor, self._run_callback, data))
+
+                # Back-pressure: wait for the worker when too many callbacks are queued
+                while len(pending) > self.max_pending_callbacks:
+                    await pending.popleft()
+        finally:
+            # Let callbacks for already received messages finish
+            for future in pending:
+                await future
+
+    def _run_callback(self, data: Dict):
+        """
+        Invoke the callback on the worker thread, logging any error.
+
+        Args:
+            data: Parsed message
+        """
+        try:
+            self.callback(data)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+
     def disconnect(self):
         """
         Disconnect from the WebSocket endpoint.
@@ -94,7 +218,7 @@ class WebSocketClient:
         Returns:
             bool: True if connected, False otherwise
         """
-        return self.websocket is not None and not self.websocket.closed
+        return self.websocket is not None and self.websocket.state is State.OPEN
     
     def get_last_message_time(self) -> float:
         """
@@ -110,6 +234,8 @@ class OrderbookWebSocketClient(WebSocketClient):
     """
     Specialized WebSocket client for L2 orderbook data.
     """
+    __slots__ = ('user_callback', 'dropped_messages')
+
     def __init__(self, uri: str, callback: Callable[[Dict], None], reconnect_interval: int = 5):
         """
         Initialize the orderbook WebSocket client.
@@ -121,6 +247,24 @@ class OrderbookWebSocketClient(WebSocketClient):
         """
         super().__init__(uri, self._process_orderbook, reconnect_interval)
         self.user_callback = callback
+        self.dropped_messages = 0
+
+    async def _enqueue(self, queue: asyncio.Queue, message):
+        """
+        Queue a message, dropping the oldest one if the queue is full.
+
+        L2 messages are full snapshots, so when processing falls behind the
+        oldest unprocessed one is the safest to discard.
+
+        Args:
+            queue: Queue of raw messages
+            message: Raw message, or None to mark the end of the stream
+        """
+        if queue.full():
+            queue.get_nowait()
+            self.dropped_messages += 1
+            logger.debug("Message queue full, dropped oldest message")
+        queue.put_nowait(message)
         
     def _process_orderbook(self, data: Dict):
         """
@@ -135,13 +279,14 @@ class OrderbookWebSocketClient(WebSocketClient):
                 logger.warning(f"Received data missing required fields: {data}")
                 return
                 
-            # Convert string prices and quantities to float
+            # Convert string prices and quantities to float arrays once;
+            # Orderbook.update consumes them without parsing again
             processed_data = {
                 'timestamp': data['timestamp'],
                 'exchange': data['exchange'],
                 'symbol': data['symbol'],
-                'asks': [[float(price), float(qty)] for price, qty in data['asks']],
-                'bids': [[float(price), float(qty)] for price, qty in data['bids']]
+                'asks': levels_to_array(data['asks']),
+                'bids': levels_to_array(data['bids'])
             }
             
             # Call the user callback with the processed data
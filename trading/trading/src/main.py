@@ -10,12 +10,20 @@ from typing import Dict, Any
 import sys
 import os
 
+from waitress import serve
+
+# uvloop (libuv-based event loop) is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add the current directory to the path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
 
 from src.data.websocket_client import OrderbookWebSocketClient
 from src.models.simulator import TradeSimulator
-from src.ui.dashboard import Dashboard
+from src.ui.dashboard import Dashboard, MAX_CONNECTION_STREAMS
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +36,8 @@ class Application:
     """
     Main application class for the trade simulator.
     """
+    __slots__ = ('websocket_uri', 'dashboard_port', 'simulator', 'websocket_client', 'dashboard')
+
     def __init__(self, websocket_uri: str, dashboard_port: int = 8050):
         """
         Initialize the application.
@@ -76,10 +86,15 @@ class Application:
 
     def run_dashboard(self):
         """
-        Run the dashboard.
+        Run the dashboard behind the waitress WSGI server.
+
+        Each open connection-events stream holds a thread, so the pool has room
+        for the maximum number of streams plus 8 threads for regular requests.
+        Reading ahead lets waitress notice closed streams and end them promptly.
         """
         try:
-            self.dashboard.run_server(debug=False, port=self.dashboard_port)
+            serve(self.dashboard.app.server, host='0.0.0.0', port=self.dashboard_port,
+                  threads=MAX_CONNECTION_STREAMS + 8, channel_request_lookahead=1)
         except Exception as e:
             logger.error(f"Dashboard error: {e}")
 
@@ -118,7 +133,10 @@ class Application:
 
         # Run the WebSocket client in the main thread
         try:
-            asyncio.run(self.run_websocket_client())
+            if uvloop is not None:
+                uvloop.run(self.run_websocket_client())
+            else:
+                asyncio.run(self.run_websocket_client())
         except KeyboardInterrupt:
             logger.info("Application stopped by user")
         except Exception as e:
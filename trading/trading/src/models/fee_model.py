@@ -4,17 +4,14 @@ Fee model for calculating trading fees based on exchange fee tiers.
 from typing import Dict, List, Tuple, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class FeeModel:
     """
     Model for calculating trading fees based on exchange fee tiers.
     """
+    __slots__ = ('fee_tiers', '_rates', '_rate_pairs')
+
     def __init__(self):
         """
         Initialize the fee model with default fee tiers.
@@ -61,23 +58,45 @@ class FeeModel:
                 }
             }
         }
-        
-    def get_fee_rate(self, 
-                    exchange: str, 
-                    market_type: str, 
-                    fee_tier: str, 
-                    is_maker: bool) -> float:
+
+        # Flattened lookup tables, rebuilt whenever the fee tiers change
+        self._build_rate_tables()
+
+    def _build_rate_tables(self):
         """
-        Get the fee rate for a specific exchange, market type, fee tier, and order type.
-        
+        Flatten the nested fee tiers into tuple-keyed lookup tables.
+        """
+        self._rates: Dict[Tuple[str, str, str, bool], float] = {}
+        self._rate_pairs: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
+        for exchange, market_types in self.fee_tiers.items():
+            for market_type, order_types in market_types.items():
+                maker_rates = order_types.get('maker', {})
+                taker_rates = order_types.get('taker', {})
+                for fee_tier, rate in maker_rates.items():
+                    self._rates[(exchange, market_type, fee_tier, True)] = rate
+                for fee_tier, rate in taker_rates.items():
+                    self._rates[(exchange, market_type, fee_tier, False)] = rate
+                for fee_tier in maker_rates.keys() & taker_rates.keys():
+                    self._rate_pairs[(exchange, market_type, fee_tier)] = (
+                        maker_rates[fee_tier], taker_rates[fee_tier]
+                    )
+
+    def _resolve_key(self,
+                     exchange: str,
+                     market_type: str,
+                     fee_tier: str,
+                     is_maker: bool) -> Tuple[str, str, str]:
+        """
+        Resolve unknown fee table keys to their defaults.
+
         Args:
             exchange: Exchange name (e.g., 'OKX')
             market_type: Market type (e.g., 'spot', 'futures')
             fee_tier: Fee tier (e.g., 'VIP0', 'VIP1')
             is_maker: Whether the order is a maker order
-            
+
         Returns:
-            float: Fee rate as a decimal (e.g., 0.001 for 0.1%)
+            Tuple[str, str, str]: (exchange, market_type, fee_tier) present in the fee tiers
         """
         if exchange not in self.fee_tiers:
             logger.warning(f"Unknown exchange: {exchange}, using default OKX fees")
@@ -92,8 +111,31 @@ class FeeModel:
         if fee_tier not in self.fee_tiers[exchange][market_type][order_type]:
             logger.warning(f"Unknown fee tier: {fee_tier}, using VIP0 fees")
             fee_tier = 'VIP0'
+
+        return exchange, market_type, fee_tier
+        
+    def get_fee_rate(self, 
+                    exchange: str, 
+                    market_type: str, 
+                    fee_tier: str, 
+                    is_maker: bool) -> float:
+        """
+        Get the fee rate for a specific exchange, market type, fee tier, and order type.
+        
+        Args:
+            exchange: Exchange name (e.g., 'OKX')
+            market_type: Market type (e.g., 'spot', 'futures')
+            fee_tier: Fee tier (e.g., 'VIP0', 'VIP1')
+            is_maker: Whether the order is a maker order
             
-        return self.fee_tiers[exchange][market_type][order_type][fee_tier]
+        Returns:
+            float: Fee rate as a decimal (e.g., 0.001 for 0.1%)
+        """
+        rate = self._rates.get((exchange, market_type, fee_tier, is_maker))
+        if rate is None:
+            rate = self._rates[self._resolve_key(exchange, market_type, fee_tier, is_maker) + (is_maker,)]
+
+        return rate
         
     def calculate_fee(self, 
                      order_value: float, 
@@ -112,10 +154,15 @@ class FeeModel:
             maker_proportion: Proportion of the order executed as maker (0.0 to 1.0)
             
         Returns:
-            Dict: Dictionary with maker_fee, taker_fee, and total_fee
+            Dict: Dictionary with maker_fee, taker_fee, total_fee, and the
+                effective rate as a fraction and as a percentage
         """
-        maker_rate = self.get_fee_rate(exchange, market_type, fee_tier, True)
-        taker_rate = self.get_fee_rate(exchange, market_type, fee_tier, False)
+        rates = self._rate_pairs.get((exchange, market_type, fee_tier))
+        if rates is None:
+            maker_rate = self.get_fee_rate(exchange, market_type, fee_tier, True)
+            taker_rate = self.get_fee_rate(exchange, market_type, fee_tier, False)
+        else:
+            maker_rate, taker_rate = rates
         
         maker_value = order_value * maker_proportion
         taker_value = order_value * (1 - maker_proportion)
@@ -123,12 +170,14 @@ class FeeModel:
         maker_fee = maker_value * maker_rate
         taker_fee = taker_value * taker_rate
         total_fee = maker_fee + taker_fee
+        effective_rate = total_fee / order_value if order_value > 0 else 0
         
         return {
             'maker_fee': maker_fee,
             'taker_fee': taker_fee,
             'total_fee': total_fee,
-            'effective_rate': total_fee / order_value if order_value > 0 else 0
+            'effective_rate': effective_rate,
+            'effective_rate_pct': effective_rate * 100
         }
         
     def add_exchange_fee_tiers(self, exchange: str, fee_tiers: Dict):
@@ -140,6 +189,7 @@ class FeeModel:
             fee_tiers: Fee tier structure
         """
         self.fee_tiers[exchange] = fee_tiers
+        self._build_rate_tables()
         logger.info(f"Updated fee tiers for {exchange}")
         
     def get_available_exchanges(self) -> List[str]:
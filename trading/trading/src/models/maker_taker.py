@@ -1,20 +1,39 @@
 """
 Model for predicting maker/taker proportion using logistic regression.
+
+Batch predictions use scipy.special.expit, a vectorized and overflow-safe
+logistic function (scipy is installed with scikit-learn).
 """
+import math
 import numpy as np
 import pandas as pd
+from numba import njit
+from scipy.special import expit
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from typing import Dict, List, Tuple, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+@njit('float64[::1](float64[::1], float64[::1], float64[::1], float64[::1])', cache=True, fastmath=True)
+def _maker_proportion_batch(order_size, spread, volatility, orderbook_imbalance):
+    """
+    Compiled fallback maker proportion heuristic over arrays of orders.
+
+    Returns:
+        np.ndarray: Estimated maker proportion (0.0 to 1.0) for each order
+    """
+    out = np.empty(order_size.shape[0])
+    for i in range(order_size.shape[0]):
+        maker_proportion = (0.5 -
+                            0.1 * math.log1p(order_size[i]) / 10.0 +
+                            0.1 * math.tanh(spread[i]) -
+                            0.2 * volatility[i] +
+                            0.1 * orderbook_imbalance[i])
+        out[i] = max(0.0, min(1.0, maker_proportion))
+    return out
+
 class MakerTakerModel:
     """
     Model for predicting the proportion of an order that will be executed as maker vs taker.
@@ -24,8 +43,12 @@ class MakerTakerModel:
         Initialize the maker/taker proportion model.
         """
         self.model = LogisticRegression(max_iter=1000)
-        self.scaler = StandardScaler()
         self.is_fitted = False
+        # Logistic weights with the feature scaling folded in
+        self._w = None
+        self._b = 0.0
+        # The same weights as Python floats, for single-order estimates
+        self._w_scalar = None
         
     def fit(self, X: np.ndarray, y: np.ndarray):
         """
@@ -40,13 +63,49 @@ class MakerTakerModel:
             return
             
         # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
         
         # Fit the model
         self.model.fit(X_scaled, y)
+
+        # Predictions use the folded weights, so the scaler is not kept
+        self._fold_scaler(scaler)
         self.is_fitted = True
         logger.info("Fitted maker/taker model")
         
+    def _fold_scaler(self, scaler: StandardScaler):
+        """
+        Fold a fitted scaler into the logistic weights.
+
+        w·((x - mean) / scale) + b == (w / scale)·x + b'
+
+        Args:
+            scaler: Scaler the estimator was fitted with
+        """
+        coef = self.model.coef_[0]
+        self._w = (coef / scaler.scale_).astype(np.float64)
+        self._b = float(self.model.intercept_[0] - (coef * scaler.mean_ / scaler.scale_).sum())
+        self._w_scalar = tuple(self._w.tolist())
+
+    def __setstate__(self, state: Dict):
+        """
+        Restore a pickled model.
+
+        Models pickled before the scaler was folded at fit time still carry a
+        fitted StandardScaler; it is folded into the weights here.
+
+        Args:
+            state: Pickled instance state
+        """
+        scaler = state.pop('scaler', None)
+        state.setdefault('_w', None)
+        state.setdefault('_b', 0.0)
+        self.__dict__.update(state)
+        if self.is_fitted and self._w is None and scaler is not None:
+            self._fold_scaler(scaler)
+        self._w_scalar = None if self._w is None else tuple(self._w.tolist())
+
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """
         Predict maker probability for given features.
@@ -61,11 +120,15 @@ class MakerTakerModel:
             logger.warning("Maker/taker model not fitted yet")
             return np.ones(X.shape[0]) * 0.5  # Default to 50% maker
             
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        # Predict probabilities
-        return self.model.predict_proba(X_scaled)[:, 1]  # Probability of class 1 (maker)
+        if self._w is None:
+            # Weights not folded (estimator fitted externally on raw features)
+            return self.model.predict_proba(X)[:, 1]
+
+        # Probability of class 1 (maker): one matrix-vector product with the
+        # folded weights, then the logistic function applied in place
+        z = np.dot(np.asarray(X, dtype=np.float64), self._w)
+        z += self._b
+        return expit(z, out=z)
         
     def estimate_maker_proportion(self, 
                                 order_size: float, 
@@ -88,11 +151,51 @@ class MakerTakerModel:
             # Fallback estimation if model not fitted
             return self._estimate_maker_proportion_fallback(order_size, spread, volatility, orderbook_imbalance)
             
-        # Create feature vector
-        X = np.array([[order_size, spread, volatility, orderbook_imbalance]])
-        
-        # Predict maker proportion
-        return float(self.predict_proba(X)[0])
+        w = self._w_scalar
+        if w is None:
+            return float(self.predict_proba(np.array([[order_size, spread, volatility, orderbook_imbalance]]))[0])
+        w_size, w_spread, w_volatility, w_imbalance = w
+
+        # Evaluate the logistic model directly on the four features
+        z = (w_size * order_size + w_spread * spread + w_volatility * volatility +
+             w_imbalance * orderbook_imbalance + self._b)
+
+        # math.exp is fastest for a scalar; only exponentiate non-positive
+        # values so large |z| cannot overflow
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        exp_z = math.exp(z)
+        return exp_z / (1.0 + exp_z)
+        
+    def estimate_maker_proportion_batch(self,
+                                        order_size,
+                                        spread,
+                                        volatility,
+                                        orderbook_imbalance) -> np.ndarray:
+        """
+        Estimate the maker proportion for many orders at once.
+
+        Arguments are 1-D arrays (or scalars) broadcast against each other.
+
+        Args:
+            order_size: Sizes of the orders in base currency
+            spread: Spreads in quote currency
+            volatility: Volatilities
+            orderbook_imbalance: Orderbook imbalances
+
+        Returns:
+            np.ndarray: Estimated maker proportion (0.0 to 1.0) for each order
+        """
+        order_size, spread, volatility, orderbook_imbalance = (
+            np.ascontiguousarray(a, dtype=np.float64) for a in np.broadcast_arrays(
+                *map(np.atleast_1d, (order_size, spread, volatility, orderbook_imbalance))
+            )
+        )
+
+        if not self.is_fitted:
+            return _maker_proportion_batch(order_size, spread, volatility, orderbook_imbalance)
+
+        return self.predict_proba(np.column_stack((order_size, spread, volatility, orderbook_imbalance)))
         
     def _estimate_maker_proportion_fallback(self, 
                                          order_size: float, 
@@ -118,10 +221,10 @@ class MakerTakerModel:
         base_proportion = 0.5
         
         # Adjust for order size (larger orders are more likely to be takers)
-        size_factor = -0.1 * np.log1p(order_size) / 10.0  # Logarithmic scaling, capped at -0.1
+        size_factor = -0.1 * math.log1p(order_size) / 10.0  # Logarithmic scaling, capped at -0.1
         
         # Adjust for spread (wider spreads encourage maker orders)
-        spread_factor = 0.1 * np.tanh(spread)  # Tanh to cap the effect
+        spread_factor = 0.1 * math.tanh(spread)  # Tanh to cap the effect
         
         # Adjust for volatility (higher volatility encourages taker orders)
         vol_factor = -0.2 * volatility
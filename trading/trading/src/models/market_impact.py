@@ -1,18 +1,165 @@
 """
 Market impact model based on Almgren-Chriss model.
 """
+import math
+from functools import lru_cache
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from numba import njit
+from typing import Dict, List, NamedTuple, Tuple, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+class MarketImpact(NamedTuple):
+    """
+    Market impact components of an order (floats, or arrays for batch results).
+    """
+    temporary_impact: float
+    permanent_impact: float
+    execution_risk: float
+    total_impact: float
+
+@njit('UniTuple(float64, 4)(float64, float64, float64, float64, float64, float64, '
+      'float64, float64, float64, float64)', cache=True, fastmath=True)
+def _impact_kernel(order_size, avg_daily_volume, volatility, mid_price, orderbook_depth,
+                   execution_time, temporary_impact_factor, permanent_impact_factor,
+                   market_vol_factor, risk_aversion):
+    """
+    Compiled Almgren-Chriss impact components for a single order.
+
+    Returns:
+        Tuple: (temporary_impact, permanent_impact, execution_risk, total_impact)
+    """
+    # Normalized order size relative to typical volume
+    normalized_size = order_size / avg_daily_volume if avg_daily_volume > 0 else 0.0
+
+    # Temporary impact: γ × t (where t is trading rate), scaled by normalized size
+    trading_rate = order_size / execution_time
+    size_scaling = math.sqrt(normalized_size) if normalized_size > 0 else 1.0
+    temporary_impact = (
+        temporary_impact_factor *
+        mid_price *
+        trading_rate *
+        size_scaling *
+        (1 + market_vol_factor * volatility)
+    )
+
+    # Permanent impact: η × X (where X is total order size)
+    permanent_impact = permanent_impact_factor * mid_price * order_size
+
+    # Execution risk: 0.5 × ψ × σ² × T × X²
+    execution_risk = 0.5 * risk_aversion * volatility ** 2 * execution_time * order_size ** 2
+
+    # Deeper orderbooks reduce market impact
+    if orderbook_depth > 0:
+        temporary_impact *= 1.0 + math.tanh(order_size / orderbook_depth)
+
+    total_impact = temporary_impact + permanent_impact + execution_risk
+    return temporary_impact, permanent_impact, execution_risk, total_impact
+
+@njit('float64[:, ::1](float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], '
+      'float64[::1], float64, float64, float64, float64)', cache=True, fastmath=True)
+def _impact_batch_kernel(order_size, avg_daily_volume, volatility, mid_price, orderbook_depth,
+                         execution_time, temporary_impact_factor, permanent_impact_factor,
+                         market_vol_factor, risk_aversion):
+    """
+    Apply _impact_kernel to each scenario in a single compiled pass.
+
+    Returns:
+        np.ndarray: (4, n) array of temporary, permanent, execution risk, and total impact
+    """
+    impacts = np.empty((4, order_size.shape[0]))
+    for i in range(order_size.shape[0]):
+        temporary_impact, permanent_impact, execution_risk, total_impact = _impact_kernel(
+            order_size[i], avg_daily_volume[i], volatility[i], mid_price[i], orderbook_depth[i],
+            execution_time[i], temporary_impact_factor, permanent_impact_factor,
+            market_vol_factor, risk_aversion
+        )
+        impacts[0, i] = temporary_impact
+        impacts[1, i] = permanent_impact
+        impacts[2, i] = execution_risk
+        impacts[3, i] = total_impact
+    return impacts
+
+@njit('UniTuple(float64[::1], 2)(float64[::1], float64, float64, float64, float64)',
+      cache=True, fastmath=True, error_model='numpy')
+def _ac_trajectory(times, total_size, time_horizon, alpha, gamma):
+    """
+    Compiled Almgren-Chriss liquidation trajectory.
+
+    Returns:
+        Tuple: (remaining_sizes, trade_sizes) at each time point
+    """
+    n = times.shape[0]
+
+    # Every element of both arrays is assigned below, so skip zero-filling
+    remaining_sizes = np.empty(n)
+    trade_sizes = np.empty(n)
+
+    if alpha == 0:
+        # Risk-neutral case: linear trading (equal-sized trades)
+        for i in range(n):
+            remaining_sizes[i] = total_size * (1.0 - times[i] / time_horizon)
+    else:
+        # Risk-averse case: formula from Almgren-Chriss paper, decays exponentially
+        k = math.sqrt(alpha * gamma)
+        scale = total_size / math.sinh(k * time_horizon)
+        for i in range(n):
+            remaining_sizes[i] = scale * math.sinh(k * (time_horizon - times[i]))
+
+    # Start from exactly the full order so the trades below sum to it by telescoping
+    remaining_sizes[0] = total_size
+
+    # Trade sizes are the changes in remaining inventory; the last trade completes the order
+    for i in range(n - 1):
+        trade_sizes[i] = remaining_sizes[i] - remaining_sizes[i + 1]
+    trade_sizes[n - 1] = remaining_sizes[n - 1]
+    return remaining_sizes, trade_sizes
+
+@lru_cache(maxsize=256)
+def _unit_schedule(time_horizon: float,
+                   volatility: float,
+                   n_intervals: int,
+                   risk_aversion: float,
+                   gamma: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Memoized Almgren-Chriss execution schedule for an order of size 1.
+
+    The trajectory is linear in the order size, so callers scale the trade
+    sizes by the total size.
+
+    Args:
+        time_horizon: Time horizon for execution (in hours)
+        volatility: Market volatility
+        n_intervals: Number of trading intervals
+        risk_aversion: Risk aversion parameter ψ
+        gamma: Temporary impact factor γ
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (times, unit trade sizes), shared and read-only
+    """
+    # Time points
+    times = np.linspace(0, time_horizon, n_intervals)
+
+    # Calculate optimal trading trajectory
+    # For risk-averse traders (high risk_aversion), execution is faster at the beginning
+    # For risk-neutral traders (low risk_aversion), execution is more evenly distributed
+
+    # Almgren-Chriss formula for optimal trading trajectory
+    alpha = risk_aversion * volatility**2
+
+    # Calculate the optimal trading trajectory using the Almgren-Chriss formula
+    # For a liquidation problem, we start with X shares and end with 0
+    # The trade sizes sum to 1 by construction
+    _, trade_sizes = _ac_trajectory(times, 1.0, time_horizon, alpha, gamma)
+
+    # The arrays are shared by every caller with the same inputs
+    times.flags.writeable = False
+    trade_sizes.flags.writeable = False
+
+    return times, trade_sizes
+
 class AlmgrenChrissModel:
     """
     Implementation of the Almgren-Chriss model for market impact.
@@ -51,7 +198,7 @@ class AlmgrenChrissModel:
                                volatility: float,
                                mid_price: float,
                                orderbook_depth: float,
-                               execution_time: float = 1.0) -> Dict[str, float]:
+                               execution_time: float = 1.0) -> MarketImpact:
         """
         Calculate market impact for a market order using the Almgren-Chriss model.
 
@@ -64,68 +211,56 @@ class AlmgrenChrissModel:
             execution_time: Time horizon for execution (in hours)
 
         Returns:
-            Dict: Dictionary with temporary, permanent, execution risk, and total impact
+            MarketImpact: Temporary, permanent, execution risk, and total impact
         """
-        # We'll use the normalized order size for additional adjustments
-        # This helps account for the relative size of the order compared to typical volume
-        normalized_size = order_size / avg_daily_volume if avg_daily_volume > 0 else 0
-
-        # Calculate temporary impact (immediate price change)
-        # Temporary impact formula: γ × t (where t is trading rate)
-        trading_rate = order_size / execution_time
-
-        # Apply a scaling factor based on normalized size
-        size_scaling = np.sqrt(normalized_size) if normalized_size > 0 else 1.0
-
-        temporary_impact = (
-            self.temporary_impact_factor *
-            mid_price *
-            trading_rate *
-            size_scaling *
-            (1 + self.market_vol_factor * volatility)
-        )
-
-        # Calculate permanent impact (lasting price change)
-        # Permanent impact formula: η × X (where X is total order size)
-        permanent_impact = (
-            self.permanent_impact_factor *
-            mid_price *
-            order_size
-        )
-
-        # Calculate execution risk
-        # Execution risk formula: 0.5 × ψ × σ² × T × X²
-        execution_risk = (
-            0.5 *
-            self.risk_aversion *
-            (volatility ** 2) *
-            execution_time *
-            (order_size ** 2)
-        )
+        return MarketImpact(*_impact_kernel(
+            order_size, avg_daily_volume, volatility, mid_price, orderbook_depth,
+            execution_time, self.temporary_impact_factor, self.permanent_impact_factor,
+            self.market_vol_factor, self.risk_aversion
+        ))
+
+    def calculate_market_impact_batch(self,
+                                     order_size,
+                                     avg_daily_volume,
+                                     volatility,
+                                     mid_price,
+                                     orderbook_depth,
+                                     execution_time=1.0) -> MarketImpact:
+        """
+        Calculate market impact for many scenarios at once.
 
-        # Adjust for orderbook depth
-        # Deeper orderbooks reduce market impact
-        depth_adjustment = 1.0
-        if orderbook_depth > 0:
-            depth_ratio = order_size / orderbook_depth
-            depth_adjustment = 1.0 + np.tanh(depth_ratio)  # Smooth function that approaches 2 for large orders
+        Arguments may be scalars or arrays and are broadcast against each other,
+        e.g. a single order evaluated over an array of volatilities.
 
-        temporary_impact *= depth_adjustment
+        Args:
+            order_size: Size of the order in base currency
+            avg_daily_volume: Average daily trading volume
+            volatility: Current market volatility
+            mid_price: Current mid price
+            orderbook_depth: Depth of the orderbook (sum of quantities)
+            execution_time: Time horizon for execution (in hours)
 
-        # Total impact is the sum of temporary and permanent impacts plus execution risk
-        total_impact = temporary_impact + permanent_impact + execution_risk
+        Returns:
+            MarketImpact: Arrays of temporary, permanent, execution risk, and total impact
+        """
+        arrays = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (
+            order_size, avg_daily_volume, volatility, mid_price, orderbook_depth, execution_time
+        )))
+        shape = arrays[0].shape
+
+        impacts = _impact_batch_kernel(
+            *(np.ascontiguousarray(x).ravel() for x in arrays),
+            self.temporary_impact_factor, self.permanent_impact_factor,
+            self.market_vol_factor, self.risk_aversion
+        )
 
-        return {
-            'temporary_impact': temporary_impact,
-            'permanent_impact': permanent_impact,
-            'execution_risk': execution_risk,
-            'total_impact': total_impact
-        }
+        return MarketImpact(*(component.reshape(shape) for component in impacts))
 
     def calculate_optimal_execution_schedule(self,
                                            total_size: float,
                                            time_horizon: float,
-                                           volatility: float) -> Tuple[np.ndarray, np.ndarray]:
+                                           volatility: float,
+                                           risk_aversion: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Calculate optimal execution schedule based on Almgren-Chriss model.
 
@@ -133,6 +268,7 @@ class AlmgrenChrissModel:
             total_size: Total size of the order to execute
             time_horizon: Time horizon for execution (in hours)
             volatility: Market volatility
+            risk_aversion: Risk aversion parameter ψ (default: the model's risk_aversion)
 
         Returns:
             Tuple[np.ndarray, np.ndarray]: (times, sizes) for execution schedule
@@ -140,65 +276,14 @@ class AlmgrenChrissModel:
         # Number of trading intervals
         n_intervals = max(int(time_horizon * 4), 2)  # At least 2 intervals, default to 4 per hour
 
-        # Time points
-        times = np.linspace(0, time_horizon, n_intervals)
-
-        # Use the risk aversion parameter from the model
-        risk_aversion = self.risk_aversion
+        if risk_aversion is None:
+            risk_aversion = self.risk_aversion
 
-        # Parameters from the Almgren-Chriss model
-        gamma = self.temporary_impact_factor  # Temporary impact factor
-
-        # Calculate optimal trading trajectory
-        # For risk-averse traders (high risk_aversion), execution is faster at the beginning
-        # For risk-neutral traders (low risk_aversion), execution is more evenly distributed
-
-        # Almgren-Chriss formula for optimal trading trajectory
-        alpha = risk_aversion * volatility**2
-
-        # Calculate the optimal trading trajectory using the Almgren-Chriss formula
-        # For a liquidation problem, we start with X shares and end with 0
-
-        # Initialize arrays for remaining inventory and trade sizes
-        remaining_sizes = np.zeros(n_intervals)
-        trade_sizes = np.zeros(n_intervals)
-
-        if alpha == 0:
-            # Risk-neutral case: linear trading (equal-sized trades)
-            trade_per_step = total_size / (n_intervals - 1)
-            for i in range(n_intervals - 1):
-                trade_sizes[i] = trade_per_step
-
-            # Calculate remaining inventory
-            remaining_sizes[0] = total_size
-            for i in range(1, n_intervals):
-                remaining_sizes[i] = remaining_sizes[i-1] - trade_sizes[i-1]
-        else:
-            # Risk-averse case: using the analytical solution from Almgren-Chriss
-            # The solution gives a trading trajectory that decays exponentially
-
-            # Calculate the optimal trading trajectory
-            sinh_term = np.sinh(np.sqrt(alpha * gamma) * time_horizon)
-
-            # Set initial inventory
-            remaining_sizes[0] = total_size
-
-            # Calculate remaining inventory at each time point
-            for i in range(1, n_intervals):
-                t = times[i]
-                # Formula from Almgren-Chriss paper
-                remaining_factor = np.sinh(np.sqrt(alpha * gamma) * (time_horizon - t)) / sinh_term
-                remaining_sizes[i] = total_size * remaining_factor
-
-            # Calculate trade sizes from the changes in remaining inventory
-            for i in range(n_intervals - 1):
-                trade_sizes[i] = remaining_sizes[i] - remaining_sizes[i+1]
-
-            # Ensure the last trade completes the order
-            trade_sizes[-1] = remaining_sizes[-1]
-
-        # Ensure we're trading the exact total size by adjusting the final trade
-        if np.abs(np.sum(trade_sizes) - total_size) > 1e-10:
-            trade_sizes[-1] += (total_size - np.sum(trade_sizes))
+        # Repeated calls with the same inputs hit the memoized unit schedule.
+        # The model parameters are part of the key since callers may change them.
+        times, unit_sizes = _unit_schedule(
+            time_horizon, volatility, n_intervals, risk_aversion, self.temporary_impact_factor
+        )
 
-        return times, trade_sizes
+        # Scaling allocates a new array; copy the times so callers cannot modify the cached arrays
+        return times.copy(), unit_sizes * total_size
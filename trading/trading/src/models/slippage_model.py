@@ -1,20 +1,33 @@
 """
 Slippage estimation model using linear or quantile regression.
 """
+import math
 import numpy as np
 import pandas as pd
+from numba import njit
 from sklearn.linear_model import LinearRegression, QuantileRegressor
 from sklearn.preprocessing import StandardScaler
 from typing import Dict, List, Tuple, Optional, Union
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+@njit('float64[::1](float64[::1], float64[::1], float64[::1], float64[::1])', cache=True, fastmath=True)
+def _slippage_batch(order_size, spread, volatility, orderbook_imbalance):
+    """
+    Compiled fallback slippage heuristic over arrays of orders.
+
+    Returns:
+        np.ndarray: Estimated slippage in quote currency for each order
+    """
+    out = np.empty(order_size.shape[0])
+    for i in range(order_size.shape[0]):
+        out[i] = (spread[i] * 0.5 +
+                  math.log1p(order_size[i]) * 0.1 +
+                  volatility[i] * 2.0 -
+                  orderbook_imbalance[i] * spread[i] * 0.3)
+    return out
+
 class SlippageModel:
     """
     Model for estimating slippage based on orderbook data.
@@ -30,8 +43,12 @@ class SlippageModel:
         self.regression_type = regression_type
         self.quantile = quantile
         self.model = None
-        self.scaler = StandardScaler()
         self.is_fitted = False
+        # Regression weights with the feature scaling folded in
+        self._w = None
+        self._b = 0.0
+        # The same weights as Python floats, for single-order estimates
+        self._w_scalar = None
         
     def fit(self, X: np.ndarray, y: np.ndarray):
         """
@@ -46,7 +63,8 @@ class SlippageModel:
             return
             
         # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
         
         # Create and fit the model
         if self.regression_type == 'linear':
@@ -57,9 +75,44 @@ class SlippageModel:
             raise ValueError(f"Unknown regression type: {self.regression_type}")
             
         self.model.fit(X_scaled, y)
+
+        # Predictions use the folded weights, so the scaler is not kept
+        self._fold_scaler(scaler)
         self.is_fitted = True
         logger.info(f"Fitted {self.regression_type} slippage model")
         
+    def _fold_scaler(self, scaler: StandardScaler):
+        """
+        Fold a fitted scaler into the regression weights.
+
+        Both regressors are affine, so w·((x - mean) / scale) + b == (w / scale)·x + b'
+
+        Args:
+            scaler: Scaler the estimator was fitted with
+        """
+        coef = np.ravel(self.model.coef_)
+        self._w = (coef / scaler.scale_).astype(np.float64)
+        self._b = float(np.ravel(self.model.intercept_)[0] - (coef * scaler.mean_ / scaler.scale_).sum())
+        self._w_scalar = tuple(self._w.tolist())
+
+    def __setstate__(self, state: Dict):
+        """
+        Restore a pickled model.
+
+        Models pickled before the scaler was folded at fit time still carry a
+        fitted StandardScaler; it is folded into the weights here.
+
+        Args:
+            state: Pickled instance state
+        """
+        scaler = state.pop('scaler', None)
+        state.setdefault('_w', None)
+        state.setdefault('_b', 0.0)
+        self.__dict__.update(state)
+        if self.is_fitted and self._w is None and scaler is not None:
+            self._fold_scaler(scaler)
+        self._w_scalar = None if self._w is None else tuple(self._w.tolist())
+
     def predict(self, X: np.ndarray) -> np.ndarray:
         """
         Predict slippage for given features.
@@ -74,11 +127,14 @@ class SlippageModel:
             logger.warning("Slippage model not fitted yet")
             return np.zeros(X.shape[0])
             
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        # Predict
-        return self.model.predict(X_scaled)
+        if self._w is None:
+            # Weights not folded (estimator fitted externally on raw features)
+            return self.model.predict(X)
+
+        # One matrix-vector product with the folded weights
+        y = np.dot(np.asarray(X, dtype=np.float64), self._w)
+        y += self._b
+        return y
         
     def estimate_slippage(self, 
                          order_size: float, 
@@ -101,11 +157,44 @@ class SlippageModel:
             # Fallback estimation if model not fitted
             return self._estimate_slippage_fallback(order_size, spread, volatility, orderbook_imbalance)
             
-        # Create feature vector
-        X = np.array([[order_size, spread, volatility, orderbook_imbalance]])
+        w = self._w_scalar
+        if w is None:
+            return float(self.predict(np.array([[order_size, spread, volatility, orderbook_imbalance]]))[0])
+        w_size, w_spread, w_volatility, w_imbalance = w
+
+        # Evaluate the regression directly on the four features
+        return float(w_size * order_size + w_spread * spread + w_volatility * volatility +
+                     w_imbalance * orderbook_imbalance + self._b)
         
-        # Predict slippage
-        return float(self.predict(X)[0])
+    def estimate_slippage_batch(self,
+                                order_size,
+                                spread,
+                                volatility,
+                                orderbook_imbalance) -> np.ndarray:
+        """
+        Estimate slippage for many market orders at once.
+
+        Arguments are 1-D arrays (or scalars) broadcast against each other.
+
+        Args:
+            order_size: Sizes of the orders in base currency
+            spread: Spreads in quote currency
+            volatility: Volatilities
+            orderbook_imbalance: Orderbook imbalances
+
+        Returns:
+            np.ndarray: Estimated slippage in quote currency for each order
+        """
+        order_size, spread, volatility, orderbook_imbalance = (
+            np.ascontiguousarray(a, dtype=np.float64) for a in np.broadcast_arrays(
+                *map(np.atleast_1d, (order_size, spread, volatility, orderbook_imbalance))
+            )
+        )
+
+        if not self.is_fitted:
+            return _slippage_batch(order_size, spread, volatility, orderbook_imbalance)
+
+        return self.predict(np.column_stack((order_size, spread, volatility, orderbook_imbalance)))
         
     def _estimate_slippage_fallback(self, 
                                   order_size: float, 
@@ -127,7 +216,7 @@ class SlippageModel:
         # Simple heuristic: slippage increases with order size, spread, and volatility
         # and decreases with favorable orderbook imbalance
         base_slippage = spread * 0.5  # Half the spread as base slippage
-        size_factor = np.log1p(order_size) * 0.1  # Logarithmic scaling for order size
+        size_factor = math.log1p(order_size) * 0.1  # Logarithmic scaling for order size
         vol_factor = volatility * 2.0  # Volatility directly impacts slippage
         
         # Imbalance adjustment: negative for buys when bids > asks, positive for sells when asks > bids
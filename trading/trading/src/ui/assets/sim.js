@@ -0,0 +1,137 @@
+/*
+ * Clientside callbacks for the trade simulator dashboard.
+ *
+ * The simulate callback stores the raw numbers of the latest simulation (or
+ * an {error} message) in the 'sim-result-store' dcc.Store; the result texts
+ * are formatted here. The figures are created once in the
+ * layout; these callbacks only swap in new trace data, so Plotly.react can
+ * diff the arrays instead of rebuilding the charts.
+ *
+ * The connection state is pushed from the server's /connection-events stream
+ * into the 'connection-store' dcc.Store only when it changes.
+ */
+const EMPTY_BOOK = {ask_px: [], ask_depth: [], bid_px: [], bid_depth: []};
+
+const CONNECTION_STATUS = {
+    disconnected: 'Not connected',
+    connected: 'Connected'
+};
+
+let connectionEvents = null;
+
+/**
+ * Format an amount with its percentage of the order value.
+ *
+ * @param {number} amount Amount in quote currency
+ * @param {number} pct Percentage of the order value
+ * @returns {string} Formatted cost
+ */
+function formatCost(amount, pct) {
+    return '$' + amount.toFixed(4) + ' (' + pct.toFixed(4) + '%)';
+}
+
+/**
+ * Copy a figure, replacing the data of its traces.
+ *
+ * @param {Object} figure Current figure
+ * @param {Object[]} updates Trace properties to set, one object per trace
+ * @returns {Object} Updated figure
+ */
+function withTraceData(figure, updates) {
+    return Object.assign({}, figure, {
+        data: figure.data.map((trace, i) => Object.assign({}, trace, updates[i]))
+    });
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    sim: {
+        /**
+         * Format the six simulation result texts.
+         *
+         * @param {Object} data Simulation result store data
+         * @returns {string[]} Slippage, fees, market impact, net cost,
+         *     maker/taker and latency texts
+         */
+        formatOutputs: function (data) {
+            if (!data) {
+                return Array(6).fill('--');
+            }
+            if (data.error) {
+                return Array(6).fill(data.error);
+            }
+
+            return [
+                formatCost(data.slippage, data.slippage_pct),
+                formatCost(data.fees, data.fees_pct),
+                formatCost(data.market_impact, data.market_impact_pct),
+                formatCost(data.net_cost, data.net_cost_pct),
+                'Maker: ' + data.maker_pct.toFixed(2) + '% / Taker: ' + (100 - data.maker_pct).toFixed(2) + '%',
+                data.latency_ms.toFixed(2) + ' ms'
+            ];
+        },
+
+        /**
+         * Update the ask and bid depth traces of the orderbook chart.
+         *
+         * @param {Object} data Simulation result store data
+         * @param {Object} figure Current orderbook figure
+         * @returns {Object} Plotly figure
+         */
+        renderOrderbook: function (data, figure) {
+            const book = data && !data.error ? data.orderbook : EMPTY_BOOK;
+
+            return withTraceData(figure, [
+                {x: book.ask_px, y: book.ask_depth},
+                {x: book.bid_px, y: book.bid_depth}
+            ]);
+        },
+
+        /**
+         * Update the values of the cost breakdown pie chart.
+         *
+         * @param {Object} data Simulation result store data
+         * @param {Object} figure Current cost breakdown figure
+         * @returns {Object} Plotly figure
+         */
+        renderCost: function (data, figure) {
+            const values = data && !data.error ? [data.fees, data.slippage, data.market_impact] : [];
+
+            return withTraceData(figure, [{values: values}]);
+        },
+
+        /**
+         * Subscribe to the server's connection events, pushing each state
+         * change into 'connection-store'. Runs once when the store mounts.
+         *
+         * @returns {Object} no_update; the store is set from the event stream
+         */
+        subscribeConnection: function () {
+            if (connectionEvents === null && typeof EventSource !== 'undefined') {
+                connectionEvents = new EventSource('connection-events');
+                connectionEvents.onmessage = function (event) {
+                    window.dash_clientside.set_props('connection-store', {data: JSON.parse(event.data)});
+                };
+            }
+            return window.dash_clientside.no_update;
+        },
+
+        /**
+         * Format the connection status and last update time.
+         *
+         * @param {Object} state Connection state from 'connection-store'
+         * @returns {string[]} Status and last update texts
+         */
+        formatConnection: function (state) {
+            if (!state) {
+                return [CONNECTION_STATUS.disconnected, 'Last update: --'];
+            }
+
+            if (state.status === 'stale') {
+                return ['No updates for over ' + state.stale_after + ' seconds', 'Last update: ' + state.last_update];
+            }
+
+            const lastUpdate = state.status === 'connected' ? 'live' : '--';
+            return [CONNECTION_STATUS[state.status], 'Last update: ' + lastUpdate];
+        }
+    }
+});
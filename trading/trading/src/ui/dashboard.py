@@ -2,23 +2,115 @@
 Dashboard UI for the trade simulator using Dash.
 """
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, Input, Output, State, ClientsideFunction, callback
 import dash_bootstrap_components as dbc
+from flask import Response, request
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 import logging
+import threading
 import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# orjson serializes to bytes; both branches return str for the event stream
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
+# Seconds without an orderbook update before the feed is reported as stale
+STALE_AFTER = 5.0
+
+# Seconds between keep-alive comments on an otherwise idle event stream
+KEEPALIVE_INTERVAL = 15.0
+
+# Each connection-events stream holds a server thread while open. Past this
+# many, clients get the current state with a reconnect delay instead, so the
+# remaining threads stay free for the dashboard's own requests.
+MAX_CONNECTION_STREAMS = 8
+STREAM_RETRY_MS = 5000
+
+# Dash 2 renamed run_server to run; resolve the available method once
+_RUN_FN_NAME = 'run' if hasattr(dash.Dash, 'run') else 'run_server'
+
+# Maximum points per orderbook side sent to the browser; deeper sides are binned by price
+MAX_CHART_LEVELS = 200
+
+def bin_levels(px: np.ndarray, qty: np.ndarray, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate orderbook levels into equal-width price buckets.
+
+    Args:
+        px: Level prices
+        qty: Level quantities
+        n_bins: Number of price buckets
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (bucket center prices, bucket quantities) of the non-empty buckets
+    """
+    quantities, edges = np.histogram(px, bins=n_bins, weights=qty)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    filled = quantities > 0
+    return centers[filled], quantities[filled]
+
+def create_orderbook_figure() -> go.Figure:
+    """
+    Create the orderbook depth chart with empty ask and bid traces.
+
+    Each side is a step-filled WebGL line of price against cumulative
+    quantity, which stays fast for deep books.
+
+    Returns:
+        go.Figure: Plotly figure
+    """
+    fig = go.Figure(data=[
+        go.Scattergl(x=[], y=[], name='Asks', mode='lines', fill='tozeroy',
+                     line={'shape': 'hv', 'color': 'red'}),
+        go.Scattergl(x=[], y=[], name='Bids', mode='lines', fill='tozeroy',
+                     line={'shape': 'hv', 'color': 'green'})
+    ])
+
+    fig.update_layout(
+        title='Orderbook',
+        xaxis_title='Price',
+        yaxis_title='Cumulative Quantity'
+    )
+
+    return fig
+
+def create_cost_breakdown_figure() -> go.Figure:
+    """
+    Create the cost breakdown figure with an empty pie trace.
+
+    Returns:
+        go.Figure: Plotly figure
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=['Fees', 'Slippage', 'Market Impact'],
+        values=[],
+        hole=.3
+    )])
+
+    fig.update_layout(
+        title='Cost Breakdown'
+    )
+
+    return fig
+
+# Empty figures as plain dicts, built and validated once at import; the
+# clientside callbacks fill in their trace data
+EMPTY_ORDERBOOK_FIGURE = create_orderbook_figure().to_plotly_json()
+EMPTY_COST_BREAKDOWN_FIGURE = create_cost_breakdown_figure().to_plotly_json()
+
 class Dashboard:
     """
     Dashboard UI for the trade simulator.
@@ -33,12 +125,25 @@ class Dashboard:
         self.simulator = simulator
         self.app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
+        # Last formatted update time, keyed by its epoch second
+        self._last_fmt_key = None
+        self._last_fmt_str = None
+
+        # Open connection-events streams
+        self._stream_slots = threading.BoundedSemaphore(MAX_CONNECTION_STREAMS)
+
+        # One thread marks the feed stale for all streams
+        threading.Thread(target=self._watch_feed, name='feed-watch', daemon=True).start()
+
         # Initialize app layout
         self.init_layout()
 
         # Set up callbacks
         self.init_callbacks()
 
+        # Set up server routes
+        self.init_routes()
+
     def init_layout(self):
         """
         Initialize the dashboard layout.
@@ -184,7 +289,7 @@ class Dashboard:
         orderbook_viz = dbc.Card([
             dbc.CardHeader("Orderbook Visualization"),
             dbc.CardBody([
-                dcc.Graph(id="orderbook-graph", style={"height": "400px"})
+                dcc.Graph(id="orderbook-graph", figure=EMPTY_ORDERBOOK_FIGURE, style={"height": "400px"})
             ])
         ], className="mt-4")
 
@@ -192,7 +297,8 @@ class Dashboard:
         cost_viz = dbc.Card([
             dbc.CardHeader("Cost Breakdown"),
             dbc.CardBody([
-                dcc.Graph(id="cost-breakdown-graph", style={"height": "400px"})
+                dcc.Graph(id="cost-breakdown-graph", figure=EMPTY_COST_BREAKDOWN_FIGURE,
+                          style={"height": "400px"})
             ])
         ], className="mt-4")
 
@@ -227,12 +333,11 @@ class Dashboard:
                 dbc.Col(connection_status, width=12)
             ]),
 
-            # Add interval component for periodic updates
-            dcc.Interval(
-                id='interval-component',
-                interval=1000,  # in milliseconds
-                n_intervals=0
-            )
+            # Latest simulation result, rendered into the charts in the browser
+            dcc.Store(id='sim-result-store'),
+
+            # Connection state, pushed from the server only when it changes
+            dcc.Store(id='connection-store')
         ], fluid=True)
 
     def init_callbacks(self):
@@ -241,14 +346,8 @@ class Dashboard:
         """
         @self.app.callback(
             [
-                Output("slippage-output", "children"),
-                Output("fees-output", "children"),
-                Output("market-impact-output", "children"),
-                Output("net-cost-output", "children"),
-                Output("maker-taker-output", "children"),
-                Output("latency-output", "children"),
-                Output("orderbook-graph", "figure"),
-                Output("cost-breakdown-graph", "figure")
+                Output("sim-result-store", "data"),
+                Output("connection-store", "data", allow_duplicate=True)
             ],
             [Input("simulate-button", "n_clicks")],
             [
@@ -265,14 +364,21 @@ class Dashboard:
         def simulate_order(n_clicks, exchange, market_type, symbol, side, quantity, volatility, fee_tier):
             """
             Simulate an order and update the UI.
+
+            The result is stored as raw numbers; the outputs and charts are
+            formatted and built clientside (assets/sim.js). The connection state
+            is refreshed along with the results, so the status is current
+            whenever the user interacts.
             """
+            connection_state = self.get_connection_state()
+
             if n_clicks is None:
-                return ["--"] * 6 + [go.Figure(), go.Figure()]
+                return [None, connection_state]
 
             # Convert quantity from USD to base currency
             mid_price = self.simulator.orderbook.get_mid_price()
             if mid_price is None or mid_price == 0:
-                return ["Orderbook not available"] * 6 + [go.Figure(), go.Figure()]
+                return [{'error': "Orderbook not available"}, connection_state]
 
             base_quantity = quantity / mid_price
 
@@ -287,123 +393,192 @@ class Dashboard:
             )
 
             if 'error' in result:
-                return [result['error']] * 6 + [go.Figure(), go.Figure()]
-
-            # Format outputs
-            slippage_output = f"${result['slippage']:.4f} ({result['slippage_percentage']:.4f}%)"
-            fees_output = f"${result['fees']['total_fee']:.4f} ({result['fees']['effective_rate'] * 100:.4f}%)"
-            market_impact_output = f"${result['market_impact']['total_impact']:.4f} ({result['market_impact_percentage']:.4f}%)"
-            net_cost_output = f"${result['net_cost']:.4f} ({result['net_cost_percentage']:.4f}%)"
-            maker_taker_output = f"Maker: {result['maker_proportion'] * 100:.2f}% / Taker: {(1 - result['maker_proportion']) * 100:.2f}%"
-            latency_output = f"{result['processing_time']:.2f} ms"
-
-            # Create orderbook visualization
-            orderbook_fig = self.create_orderbook_visualization()
-
-            # Create cost breakdown visualization
-            cost_breakdown_fig = self.create_cost_breakdown_visualization(result)
-
-            return [
-                slippage_output,
-                fees_output,
-                market_impact_output,
-                net_cost_output,
-                maker_taker_output,
-                latency_output,
-                orderbook_fig,
-                cost_breakdown_fig
-            ]
+                return [{'error': result['error']}, connection_state]
+
+            # Costs with their percentage of the order value
+            store_data = {
+                'slippage': result['slippage'],
+                'slippage_pct': result['slippage_percentage'],
+                'fees': result['fees']['total_fee'],
+                'fees_pct': result['fees']['effective_rate_pct'],
+                'market_impact': result['market_impact'].total_impact,
+                'market_impact_pct': result['market_impact_percentage'],
+                'net_cost': result['net_cost'],
+                'net_cost_pct': result['net_cost_percentage'],
+                'maker_pct': result['maker_proportion_pct'],
+                'latency_ms': result['processing_time'],
+                'orderbook': self.get_orderbook_payload()
+            }
+
+            return [store_data, connection_state]
+
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='sim', function_name='formatOutputs'),
+            [
+                Output("slippage-output", "children"),
+                Output("fees-output", "children"),
+                Output("market-impact-output", "children"),
+                Output("net-cost-output", "children"),
+                Output("maker-taker-output", "children"),
+                Output("latency-output", "children")
+            ],
+            Input("sim-result-store", "data")
+        )
 
-        @self.app.callback(
+        # The figures are created once in the layout; these only swap in new trace data
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='sim', function_name='renderOrderbook'),
+            Output("orderbook-graph", "figure"),
+            Input("sim-result-store", "data"),
+            State("orderbook-graph", "figure")
+        )
+
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='sim', function_name='renderCost'),
+            Output("cost-breakdown-graph", "figure"),
+            Input("sim-result-store", "data"),
+            State("cost-breakdown-graph", "figure")
+        )
+
+        # Connection status is pushed over /connection-events and formatted in the browser
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='sim', function_name='subscribeConnection'),
+            Output("connection-store", "data"),
+            Input("connection-store", "id")
+        )
+
+        self.app.clientside_callback(
+            ClientsideFunction(namespace='sim', function_name='formatConnection'),
             [
                 Output("connection-status", "children"),
                 Output("last-update-time", "children")
             ],
-            [Input("interval-component", "n_intervals")]
+            Input("connection-store", "data")
         )
-        def update_connection_status(n_intervals):
-            """
-            Update the connection status.
-            """
-            if self.simulator.last_update_time == 0:
-                status = "Not connected"
-                last_update = "--"
-            else:
-                time_since_update = time.time() - self.simulator.last_update_time
-                if time_since_update < 5:
-                    status = "Connected"
-                else:
-                    status = f"Last update {time_since_update:.1f} seconds ago"
 
-                last_update = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.simulator.last_update_time))
+    def init_routes(self):
+        """
+        Initialize the server routes used by the dashboard.
+        """
+        route = self.app.config.routes_pathname_prefix + 'connection-events'
+        self.app.server.add_url_rule(route, 'connection_events', self.stream_connection_events)
 
-            return status, f"Last update: {last_update}"
+    def _watch_feed(self):
+        """
+        Mark the feed stale when no update has arrived for STALE_AFTER seconds.
 
-    def create_orderbook_visualization(self) -> go.Figure:
+        Runs on its own thread for the lifetime of the dashboard. The
+        simulator marks the feed live again on the next update; both changes
+        notify the simulator's feed condition.
+        """
+        simulator = self.simulator
+        condition = simulator.feed_condition
+        with condition:
+            while True:
+                condition.wait_for(lambda: simulator.feed_live)
+                remaining = simulator.last_update_time + STALE_AFTER - time.time()
+                if remaining > 0:
+                    condition.wait(remaining)
+                    continue
+
+                simulator.feed_live = False
+                # An update that read feed_live before it was cleared did not
+                # notify; its time is visible by now, so undo instead
+                if time.time() - simulator.last_update_time < STALE_AFTER:
+                    simulator.feed_live = True
+                    continue
+                condition.notify_all()
+
+    def get_connection_state(self) -> Dict[str, Any]:
         """
-        Create a visualization of the orderbook.
+        Get the connection state of the orderbook feed.
 
         Returns:
-            go.Figure: Plotly figure
+            Dict: Status ('disconnected', 'connected' or 'stale') and, when stale,
+                the time of the last update and the staleness threshold in seconds
         """
-        asks_df, bids_df = self.simulator.orderbook.to_dataframe()
-
-        fig = go.Figure()
-
-        if not asks_df.empty:
-            fig.add_trace(go.Bar(
-                x=asks_df['price'],
-                y=asks_df['quantity'],
-                name='Asks',
-                marker_color='red'
-            ))
-
-        if not bids_df.empty:
-            fig.add_trace(go.Bar(
-                x=bids_df['price'],
-                y=bids_df['quantity'],
-                name='Bids',
-                marker_color='green'
-            ))
-
-        fig.update_layout(
-            title='Orderbook',
-            xaxis_title='Price',
-            yaxis_title='Quantity',
-            barmode='overlay',
-            bargap=0
-        )
+        last_update_time = self.simulator.last_update_time
+        if last_update_time == 0:
+            return {'status': 'disconnected', 'last_update': None}
+
+        if self.simulator.feed_live:
+            return {'status': 'connected', 'last_update': None}
 
-        return fig
+        # The update time is fixed while stale; format it once per second value
+        key = int(last_update_time)
+        if key != self._last_fmt_key:
+            self._last_fmt_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(key))
+            self._last_fmt_key = key
 
-    def create_cost_breakdown_visualization(self, result: Dict) -> go.Figure:
+        return {'status': 'stale', 'last_update': self._last_fmt_str, 'stale_after': STALE_AFTER}
+
+    def stream_connection_events(self) -> Response:
         """
-        Create a visualization of the cost breakdown.
+        Stream connection state changes to the browser as server-sent events.
 
-        Args:
-            result: Simulation result
+        The stream blocks on the simulator's feed condition and wakes only
+        when the feed goes live or stale, or to send a keep-alive comment.
+
+        When MAX_CONNECTION_STREAMS streams are already open, the response
+        carries only the current state and asks the browser to reconnect after
+        STREAM_RETRY_MS, so extra tabs poll instead of holding a thread.
 
         Returns:
-            go.Figure: Plotly figure
+            Response: text/event-stream response
         """
-        categories = ['Fees', 'Slippage', 'Market Impact']
-        values = [
-            result['fees']['total_fee'],
-            result['slippage'],
-            result['market_impact']['total_impact']
-        ]
-
-        fig = go.Figure(data=[go.Pie(
-            labels=categories,
-            values=values,
-            hole=.3
-        )])
-
-        fig.update_layout(
-            title='Cost Breakdown'
-        )
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        # Set by waitress when it keeps reading during a request
+        # (channel_request_lookahead > 0); otherwise a closed client is only
+        # noticed when a write fails
+        client_disconnected = request.environ.get('waitress.client_disconnected', lambda: False)
+
+        if not self._stream_slots.acquire(blocking=False):
+            return Response(f"retry: {STREAM_RETRY_MS}\ndata: {_dumps(self.get_connection_state())}\n\n",
+                            mimetype='text/event-stream', headers=headers)
+
+        def events():
+            condition = self.simulator.feed_condition
+            state = self.get_connection_state()
+            yield f"data: {_dumps(state)}\n\n"
+            while not client_disconnected():
+                with condition:
+                    changed = condition.wait_for(lambda: self.get_connection_state() != state,
+                                                 timeout=KEEPALIVE_INTERVAL)
+                if changed:
+                    state = self.get_connection_state()
+                    yield f"data: {_dumps(state)}\n\n"
+                else:
+                    # Comment line, so closed connections are noticed and released
+                    yield ": keep-alive\n\n"
+
+        response = Response(events(), mimetype='text/event-stream', headers=headers)
+        # The server closes the response when the stream ends or the client goes away
+        response.call_on_close(self._stream_slots.release)
+        return response
 
-        return fig
+    def get_orderbook_payload(self) -> Dict[str, List[float]]:
+        """
+        Get the orderbook levels for the clientside depth chart.
+
+        Returns:
+            Dict: Parallel lists of ask/bid prices and cumulative quantities, best level first
+        """
+        ask_px, ask_qty, bid_px, bid_qty = self.simulator.orderbook.to_arrays()
+
+        # Keep full resolution for typical depths; cap the points sent for deep books
+        if ask_px.size > MAX_CHART_LEVELS:
+            ask_px, ask_qty = bin_levels(ask_px, ask_qty, MAX_CHART_LEVELS)
+        if bid_px.size > MAX_CHART_LEVELS:
+            # Buckets come out in ascending price; bids accumulate from the highest
+            bid_px, bid_qty = bin_levels(bid_px, bid_qty, MAX_CHART_LEVELS)
+            bid_px, bid_qty = bid_px[::-1], bid_qty[::-1]
+
+        return {
+            'ask_px': ask_px.tolist(),
+            'ask_depth': np.cumsum(ask_qty).tolist(),
+            'bid_px': bid_px.tolist(),
+            'bid_depth': np.cumsum(bid_qty).tolist()
+        }
 
     def run_server(self, debug=True, port=8050):
         """
@@ -414,12 +589,7 @@ class Dashboard:
             port: Port to run on
         """
         try:
-            # Try the new method first
-            self.app.run(debug=debug, port=port, host="0.0.0.0")
-        except Exception as e:
-            # Fall back to the old method
-            try:
-                self.app.run_server(debug=debug, port=port, host="0.0.0.0")
-            except Exception as e:
-                # If both fail, log the error
-                logging.error(f"Failed to start dashboard: {e}")
+            getattr(self.app, _RUN_FN_NAME)(debug=debug, port=port, host="0.0.0.0")
+        except OSError as e:
+            # e.g. the port is already in use
+            logger.error(f"Failed to start dashboard: {e}")
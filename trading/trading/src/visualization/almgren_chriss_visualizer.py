@@ -9,14 +9,32 @@ for optimal trade execution, including:
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from typing import Tuple, Dict, List, Optional
 import pandas as pd
 
 from src.models.market_impact import AlmgrenChrissModel
 
 
+def _remaining_inventory(total_size: float, trade_sizes: np.ndarray) -> np.ndarray:
+    """
+    Calculate the inventory remaining before each trade of a schedule.
+
+    Args:
+        total_size: Total size of the order to execute
+        trade_sizes: Trade sizes of the execution schedule
+
+    Returns:
+        np.ndarray: Remaining inventory at each time point
+    """
+    remaining_inventory = np.empty_like(trade_sizes)
+    remaining_inventory[0] = total_size
+    np.cumsum(trade_sizes[:-1], out=remaining_inventory[1:])
+    np.subtract(total_size, remaining_inventory[1:], out=remaining_inventory[1:])
+    return remaining_inventory
+
+
 class AlmgrenChrissVisualizer:
     """
     Visualization tools for the Almgren-Chriss model.
@@ -35,7 +53,7 @@ class AlmgrenChrissVisualizer:
                               total_size: float, 
                               time_horizon: float, 
                               volatility: float,
-                              title: str = "Optimal Execution Schedule") -> Figure:
+                              title: str = "Optimal Execution Schedule") -> go.Figure:
         """
         Plot the optimal execution schedule based on the Almgren-Chriss model.
         
@@ -46,7 +64,7 @@ class AlmgrenChrissVisualizer:
             title: Title for the plot
             
         Returns:
-            Figure: Matplotlib figure object
+            go.Figure: Plotly figure
         """
         # Calculate optimal execution schedule
         times, trade_sizes = self.model.calculate_optimal_execution_schedule(
@@ -54,34 +72,35 @@ class AlmgrenChrissVisualizer:
         )
         
         # Calculate cumulative execution
-        remaining_inventory = np.zeros_like(times)
-        remaining_inventory[0] = total_size
-        for i in range(1, len(times)):
-            remaining_inventory[i] = remaining_inventory[i-1] - trade_sizes[i-1]
+        remaining_inventory = _remaining_inventory(total_size, trade_sizes)
         
         # Create figure
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.05)
         
         # Plot remaining inventory
-        ax1.plot(times, remaining_inventory, 'b-', linewidth=2)
-        ax1.set_ylabel('Remaining Inventory')
-        ax1.set_title(title)
-        ax1.grid(True)
+        fig.add_trace(go.Scatter(
+            x=times, y=remaining_inventory, mode='lines',
+            line=dict(color='blue', width=2), name='Remaining Inventory'
+        ), row=1, col=1)
         
         # Plot trade sizes
-        ax2.bar(times, trade_sizes, width=time_horizon/len(times)*0.8, alpha=0.7)
-        ax2.set_xlabel('Time')
-        ax2.set_ylabel('Trade Size')
-        ax2.grid(True)
+        fig.add_trace(go.Bar(
+            x=times, y=trade_sizes, width=time_horizon/len(times)*0.8,
+            opacity=0.7, name='Trade Size'
+        ), row=2, col=1)
+        
+        fig.update_yaxes(title_text='Remaining Inventory', row=1, col=1)
+        fig.update_yaxes(title_text='Trade Size', row=2, col=1)
+        fig.update_xaxes(title_text='Time', row=2, col=1)
+        fig.update_layout(title=title, height=800, width=1000, showlegend=False)
         
-        plt.tight_layout()
         return fig
     
     def compare_risk_aversion(self, 
                              total_size: float, 
                              time_horizon: float, 
                              volatility: float,
-                             risk_aversions: List[float]) -> Figure:
+                             risk_aversions: List[float]) -> go.Figure:
         """
         Compare optimal execution schedules for different risk aversion parameters.
         
@@ -92,43 +111,34 @@ class AlmgrenChrissVisualizer:
             risk_aversions: List of risk aversion parameters to compare
             
         Returns:
-            Figure: Matplotlib figure object
+            go.Figure: Plotly figure
         """
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Store original risk aversion
-        original_risk_aversion = self.model.risk_aversion
+        fig = go.Figure()
         
         # Calculate and plot for each risk aversion
         for risk_aversion in risk_aversions:
-            # Temporarily set risk aversion
-            self.model.risk_aversion = risk_aversion
-            
-            # Calculate optimal execution
-            times, _ = self.model.calculate_optimal_execution_schedule(
-                total_size, time_horizon, volatility
+            # Calculate optimal execution (memoized, and the model is left untouched)
+            times, trade_sizes = self.model.calculate_optimal_execution_schedule(
+                total_size, time_horizon, volatility, risk_aversion
             )
             
             # Calculate remaining inventory
-            remaining_inventory = np.zeros_like(times)
-            remaining_inventory[0] = total_size
-            for i in range(1, len(times)):
-                remaining_inventory[i] = remaining_inventory[i-1] - _[i-1]
+            remaining_inventory = _remaining_inventory(total_size, trade_sizes)
             
             # Plot
-            ax.plot(times, remaining_inventory, linewidth=2, 
-                   label=f'ψ = {risk_aversion}')
-        
-        # Restore original risk aversion
-        self.model.risk_aversion = original_risk_aversion
-        
-        ax.set_xlabel('Time')
-        ax.set_ylabel('Remaining Inventory')
-        ax.set_title('Effect of Risk Aversion on Execution Schedule')
-        ax.grid(True)
-        ax.legend()
+            fig.add_trace(go.Scatter(
+                x=times, y=remaining_inventory, mode='lines',
+                line=dict(width=2), name=f'ψ = {risk_aversion}'
+            ))
+        
+        fig.update_layout(
+            title='Effect of Risk Aversion on Execution Schedule',
+            xaxis_title='Time',
+            yaxis_title='Remaining Inventory',
+            height=600,
+            width=1000
+        )
         
-        plt.tight_layout()
         return fig
     
     def visualize_market_impact(self,
@@ -137,7 +147,7 @@ class AlmgrenChrissVisualizer:
                                volatility: float,
                                mid_price: float,
                                orderbook_depth: float,
-                               execution_time: float = 1.0) -> Figure:
+                               execution_time: float = 1.0) -> go.Figure:
         """
         Visualize market impact components for different order sizes.
         
@@ -150,43 +160,37 @@ class AlmgrenChrissVisualizer:
             execution_time: Time horizon for execution
             
         Returns:
-            Figure: Matplotlib figure object
+            go.Figure: Plotly figure
         """
-        # Calculate impact for each order size
-        impacts = []
-        for size in order_sizes:
-            impact = self.model.calculate_market_impact(
-                size, avg_daily_volume, volatility, mid_price, 
-                orderbook_depth, execution_time
-            )
-            impacts.append(impact)
-        
-        # Extract components
-        temp_impacts = [impact['temporary_impact'] for impact in impacts]
-        perm_impacts = [impact['permanent_impact'] for impact in impacts]
-        exec_risks = [impact['execution_risk'] for impact in impacts]
-        total_impacts = [impact['total_impact'] for impact in impacts]
+        # Calculate impact components for all order sizes in one call
+        impacts = self.model.calculate_market_impact_batch(
+            np.asarray(order_sizes, dtype=np.float64), avg_daily_volume, volatility,
+            mid_price, orderbook_depth, execution_time
+        )
         
         # Create figure
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Plot components
-        width = 0.2
-        x = np.arange(len(order_sizes))
-        
-        ax.bar(x - 1.5*width, temp_impacts, width, label='Temporary Impact')
-        ax.bar(x - 0.5*width, perm_impacts, width, label='Permanent Impact')
-        ax.bar(x + 0.5*width, exec_risks, width, label='Execution Risk')
-        ax.bar(x + 1.5*width, total_impacts, width, label='Total Impact')
-        
-        ax.set_xlabel('Order Size')
-        ax.set_ylabel('Impact (Price Units)')
-        ax.set_title('Market Impact Components by Order Size')
-        ax.set_xticks(x)
-        ax.set_xticklabels([f'{size}' for size in order_sizes])
-        ax.legend()
+        fig = go.Figure()
+        
+        # Plot components as grouped bars, one category per order size
+        x = [f'{size}' for size in order_sizes]
+        components = [
+            ('Temporary Impact', impacts.temporary_impact),
+            ('Permanent Impact', impacts.permanent_impact),
+            ('Execution Risk', impacts.execution_risk),
+            ('Total Impact', impacts.total_impact)
+        ]
+        for i, (name, values) in enumerate(components):
+            fig.add_trace(go.Bar(x=x, y=values, name=name, offsetgroup=i))
+        
+        fig.update_layout(
+            title='Market Impact Components by Order Size',
+            xaxis_title='Order Size',
+            yaxis_title='Impact (Price Units)',
+            barmode='group',
+            height=600,
+            width=1000
+        )
         
-        plt.tight_layout()
         return fig
 
 
@@ -225,4 +229,5 @@ if __name__ == "__main__":
         orderbook_depth=10000
     )
     
-    plt.show()
+    for fig in (fig1, fig2, fig3):
+        fig.show()
@@ -0,0 +1,130 @@
+"""
+Tests for the dashboard data helpers.
+"""
+import unittest
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.orderbook import Orderbook
+from src.models.simulator import TradeSimulator
+from src.ui import dashboard as dashboard_module
+from src.ui.dashboard import Dashboard, bin_levels, MAX_CHART_LEVELS, MAX_CONNECTION_STREAMS
+
+class TestDashboard(unittest.TestCase):
+    """
+    Tests for the dashboard data helpers.
+    """
+    def setUp(self):
+        """
+        Set up a dashboard over a deep orderbook.
+        """
+        rng = np.random.default_rng(0)
+        n_levels = 500
+        self.asks = np.column_stack((45000.5 + 0.5 * np.arange(n_levels), rng.uniform(0.1, 5.0, n_levels)))
+        self.bids = np.column_stack((44999.5 - 0.5 * np.arange(n_levels), rng.uniform(0.1, 5.0, n_levels)))
+
+        self.simulator = TradeSimulator()
+        self.simulator.orderbook = Orderbook(max_depth=1000)
+        self.simulator.update_orderbook({'asks': self.asks, 'bids': self.bids})
+        self.dashboard = Dashboard(self.simulator)
+
+    def test_bin_levels(self):
+        """
+        Test that binning keeps the total quantity within the price range.
+        """
+        centers, quantities = bin_levels(self.asks[:, 0], self.asks[:, 1], MAX_CHART_LEVELS)
+
+        self.assertLessEqual(len(centers), MAX_CHART_LEVELS)
+        self.assertEqual(len(centers), len(quantities))
+        self.assertAlmostEqual(quantities.sum(), self.asks[:, 1].sum())
+        self.assertTrue(np.all(np.diff(centers) > 0))
+        self.assertGreaterEqual(centers[0], self.asks[0, 0])
+        self.assertLessEqual(centers[-1], self.asks[-1, 0])
+
+    def test_orderbook_payload_deep_book(self):
+        """
+        Test the depth chart payload for sides deeper than the chart limit.
+        """
+        payload = self.dashboard.get_orderbook_payload()
+
+        for side, levels in (('ask', self.asks), ('bid', self.bids)):
+            px = np.array(payload[f'{side}_px'])
+            depth = np.array(payload[f'{side}_depth'])
+            self.assertLessEqual(len(px), MAX_CHART_LEVELS)
+            self.assertEqual(len(px), len(depth))
+            # Cumulative quantity grows away from the best level and ends at the side total
+            self.assertTrue(np.all(np.diff(depth) > 0))
+            self.assertAlmostEqual(depth[-1], levels[:, 1].sum())
+
+        # Best level first: asks ascending, bids descending
+        self.assertTrue(np.all(np.diff(payload['ask_px']) > 0))
+        self.assertTrue(np.all(np.diff(payload['bid_px']) < 0))
+        self.assertLess(payload['bid_px'][0], payload['ask_px'][0])
+
+    def test_orderbook_payload_shallow_book(self):
+        """
+        Test that sides within the chart limit are sent level by level.
+        """
+        self.simulator.update_orderbook({'asks': self.asks[:5], 'bids': self.bids[:5]})
+        payload = self.dashboard.get_orderbook_payload()
+
+        np.testing.assert_array_equal(payload['bid_px'], self.bids[:5, 0])
+        np.testing.assert_allclose(payload['bid_depth'], np.cumsum(self.bids[:5, 1]))
+
+    def test_connection_stream_cap(self):
+        """
+        Test that connection-events streams are capped and released when closed.
+        """
+        client = self.dashboard.app.server.test_client()
+
+        streams = [client.get('/connection-events', buffered=False) for _ in range(MAX_CONNECTION_STREAMS)]
+        for stream in streams:
+            self.assertTrue(stream.headers['Content-Type'].startswith('text/event-stream'))
+
+        # Past the cap: the current state and a reconnect delay, not a held stream
+        capped = client.get('/connection-events')
+        self.assertIn('retry:', capped.get_data(as_text=True))
+        self.assertIn('"status":', capped.get_data(as_text=True))
+
+        # Closing a stream frees its slot
+        streams.pop().close()
+        reopened = client.get('/connection-events', buffered=False)
+        self.assertNotIn('retry:', next(reopened.response).decode())
+
+        for stream in streams + [reopened]:
+            stream.close()
+
+    @mock.patch.object(dashboard_module, 'STALE_AFTER', 0.2)
+    def test_connection_state_transitions(self):
+        """
+        Test that a stream is woken when the feed goes live and again when it goes stale.
+        """
+        simulator = TradeSimulator()
+        dashboard = Dashboard(simulator)
+        stream = dashboard.app.server.test_client().get('/connection-events', buffered=False)
+        events = stream.response
+
+        self.assertIn('"disconnected"', next(events).decode())
+
+        simulator.update_orderbook({'asks': self.asks[:5], 'bids': self.bids[:5]})
+        self.assertIn('"connected"', next(events).decode())
+        self.assertTrue(simulator.feed_live)
+
+        # No further updates: the watcher marks the feed stale after STALE_AFTER
+        self.assertIn('"stale"', next(events).decode())
+        self.assertFalse(simulator.feed_live)
+
+        # The next update brings it back
+        simulator.update_orderbook({'asks': self.asks[:5], 'bids': self.bids[:5]})
+        self.assertIn('"connected"', next(events).decode())
+
+        stream.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,12 +5,18 @@ import unittest
 import sys
 import os
 import json
+import pickle
+import types
+from unittest import mock
+
+import numpy as np
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.models.simulator import TradeSimulator
-from src.data.orderbook import Orderbook
+from src.data import orderbook as orderbook_module, _ob_kernels
+from src.data.orderbook import Orderbook, levels_to_array
 from src.models.slippage_model import SlippageModel
 from src.models.market_impact import AlmgrenChrissModel
 from src.models.maker_taker import MakerTakerModel
@@ -20,32 +26,40 @@ class TestSimulator(unittest.TestCase):
     """
     Tests for the trade simulator.
     """
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up the test.
+        Set up the sample orderbook data, shared by all tests (none mutate it).
+
+        Levels are float64 [price, quantity] arrays, as produced by the
+        WebSocket client.
         """
-        self.simulator = TradeSimulator()
-        
-        # Create sample orderbook data
-        self.sample_data = {
+        cls.sample_data = {
             'timestamp': '2023-05-04T10:39:13Z',
             'exchange': 'OKX',
             'symbol': 'BTC-USDT-SWAP',
-            'asks': [
-                ['45000.5', '1.5'],
-                ['45001.0', '2.0'],
-                ['45002.0', '3.0'],
-                ['45003.0', '4.0'],
-                ['45004.0', '5.0']
-            ],
-            'bids': [
-                ['44999.5', '1.0'],
-                ['44999.0', '2.0'],
-                ['44998.0', '3.0'],
-                ['44997.0', '4.0'],
-                ['44996.0', '5.0']
-            ]
+            'asks': np.array([
+                [45000.5, 1.5],
+                [45001.0, 2.0],
+                [45002.0, 3.0],
+                [45003.0, 4.0],
+                [45004.0, 5.0]
+            ], dtype=np.float64),
+            'bids': np.array([
+                [44999.5, 1.0],
+                [44999.0, 2.0],
+                [44998.0, 3.0],
+                [44997.0, 4.0],
+                [44996.0, 5.0]
+            ], dtype=np.float64)
         }
+
+    def setUp(self):
+        """
+        Set up the test.
+        """
+        # The simulator holds the orderbook, so each test gets a fresh one
+        self.simulator = TradeSimulator()
         
     def test_update_orderbook(self):
         """
@@ -112,13 +126,13 @@ class TestSimulator(unittest.TestCase):
         self.assertGreaterEqual(result['slippage'], 0)
         
         # Market impact should be positive
-        self.assertGreater(result['market_impact']['total_impact'], 0)
+        self.assertGreater(result['market_impact'].total_impact, 0)
         
         # Net cost should be the sum of fees, slippage, and market impact
         expected_net_cost = (
             result['fees']['total_fee'] + 
             result['slippage'] + 
-            result['market_impact']['total_impact']
+            result['market_impact'].total_impact
         )
         self.assertAlmostEqual(result['net_cost'], expected_net_cost)
         
@@ -162,5 +176,260 @@ class TestSimulator(unittest.TestCase):
         expected_imbalance = (total_bid_volume - total_ask_volume) / (total_bid_volume + total_ask_volume)
         self.assertAlmostEqual(self.simulator.orderbook.get_orderbook_imbalance(), expected_imbalance)
         
+    def test_mid_spread_cache_invalidated_on_update(self):
+        """
+        Test that cached mid price and spread are refreshed by the next update.
+        """
+        orderbook = Orderbook()
+        self.assertIsNone(orderbook.get_mid_price())
+        self.assertIsNone(orderbook.get_spread())
+
+        orderbook.update({'asks': [['101', '1']], 'bids': [['99', '1']]})
+        self.assertAlmostEqual(orderbook.get_mid_price(), 100.0)
+        self.assertAlmostEqual(orderbook.get_spread(), 2.0)
+
+        orderbook.update({'asks': [['102', '1']], 'bids': [['100', '1']]})
+        self.assertAlmostEqual(orderbook.get_mid_price(), 101.0)
+        self.assertAlmostEqual(orderbook.get_spread(), 2.0)
+
+    def test_to_arrays_shapes(self):
+        """
+        Test the sorted level arrays and cumulative quantities.
+        """
+        self.simulator.update_orderbook(self.sample_data)
+        orderbook = self.simulator.orderbook
+
+        ask_px, ask_qty, bid_px, bid_qty = orderbook.to_arrays()
+        for array in (ask_px, ask_qty, bid_px, bid_qty):
+            self.assertEqual(array.shape, (5,))
+        np.testing.assert_array_equal(ask_px, [45000.5, 45001.0, 45002.0, 45003.0, 45004.0])
+        np.testing.assert_array_equal(bid_qty, [1.0, 2.0, 3.0, 4.0, 5.0])
+        np.testing.assert_array_equal(orderbook.ask_cum, [1.5, 3.5, 6.5, 10.5, 15.5])
+
+    def test_equal_price_bids_ordering(self):
+        """
+        Test that equal-priced bids keep their order, so the first ones are kept at max depth.
+        """
+        orderbook = Orderbook(max_depth=2)
+        orderbook.update({'asks': [], 'bids': [['99', '1'], ['100', '2'], ['99', '3']]})
+        np.testing.assert_array_equal(orderbook.bid_px, [100.0, 99.0])
+        np.testing.assert_array_equal(orderbook.bid_qty, [2.0, 1.0])
+
+    def test_stale_native_kernels_ignored(self):
+        """
+        Test that a native kernel extension built from older kernels is not used.
+        """
+        # An extension built before the cumulative-quantity kernels were renamed
+        stale = types.ModuleType('src.data._ob_native')
+        stale.volume_at_price = stale.cum_vol_up_to = stale.price_index_for_volume = lambda *args: 0.0
+
+        with mock.patch.dict(sys.modules, {'src.data._ob_native': stale}):
+            kernels = orderbook_module._load_kernels()
+
+        self.assertEqual(kernels, (_ob_kernels.volume_at_price, _ob_kernels.cum_vol_from_cum,
+                                   _ob_kernels.price_index_for_cum_volume, _ob_kernels.sort_levels_into))
+
+    def test_levels_to_array(self):
+        """
+        Test parsing orderbook levels into float arrays.
+        """
+        # Raw string levels, as sent by the exchange
+        levels = levels_to_array([['45000.5', '1.5'], ['45001.0', '2.0'], ['45002.0', '3.0'],
+                                  ['45003.0', '4.0'], ['45004.0', '5.0']])
+        self.assertEqual(levels.shape, (5, 2))
+        self.assertEqual(levels.dtype, np.float64)
+        self.assertAlmostEqual(levels[0, 0], 45000.5)
+        self.assertAlmostEqual(levels[0, 1], 1.5)
+
+        # Float arrays are used as-is
+        self.assertTrue(np.shares_memory(levels_to_array(levels), levels))
+
+        self.assertEqual(levels_to_array([]).shape, (0, 2))
+
+        # Extra fields are dropped; malformed rows are rejected instead of misaligned
+        wide = levels_to_array([['100', '1', '0', '2'], ['101', '3', '0', '4']])
+        np.testing.assert_array_equal(wide, [[100.0, 1.0], [101.0, 3.0]])
+        np.testing.assert_array_equal(levels_to_array(np.array([[100.0, 1.0, 0.0, 2.0]])), [[100.0, 1.0]])
+        with self.assertRaises(ValueError):
+            levels_to_array([['100', '1'], ['101', '3', '0']])
+        with self.assertRaises(ValueError):
+            levels_to_array([['100']])
+
+    def test_sort_levels_into(self):
+        """
+        Test the fused sort and cumulative sum kernel on sorted and unsorted levels.
+        """
+        out = np.zeros((6, 3))
+        bids = np.array([[99.0, 1.0], [98.0, 2.0], [97.0, 3.0], [96.0, 4.0]])
+
+        # Levels that arrive best-first are copied and truncated to the buffer width
+        self.assertEqual(_ob_kernels.sort_levels_into(bids, out, 3, False), 3)
+        np.testing.assert_array_equal(out[3:], [[99.0, 98.0, 97.0], [1.0, 2.0, 3.0], [1.0, 3.0, 6.0]])
+        np.testing.assert_array_equal(out[:3], 0.0)
+
+        # Shuffled levels are sorted first
+        self.assertEqual(_ob_kernels.sort_levels_into(bids[[2, 0, 3, 1]], out, 0, True), 3)
+        np.testing.assert_array_equal(out[:3], [[96.0, 97.0, 98.0], [4.0, 3.0, 2.0], [4.0, 7.0, 9.0]])
+
+        # Wider rows and empty sides
+        self.assertEqual(_ob_kernels.sort_levels_into(np.array([[100.0, 1.0, 0.0, 2.0]]), out, 0, True), 1)
+        self.assertEqual(out[0, 0], 100.0)
+        self.assertEqual(_ob_kernels.sort_levels_into(np.empty((0, 2)), out, 0, True), 0)
+
+    def test_market_impact_batch(self):
+        """
+        Test that batch market impact matches the per-order calculation.
+        """
+        model = AlmgrenChrissModel()
+        volatilities = [0.1, 0.3, 0.5, 0.7]
+
+        batch = model.calculate_market_impact_batch(1000, 10000, volatilities, 100.0, 5000, 4.0)
+
+        for i, vol in enumerate(volatilities):
+            impact = model.calculate_market_impact(1000, 10000, vol, 100.0, 5000, 4.0)
+            for batch_values, value in zip(batch, impact):
+                self.assertAlmostEqual(batch_values[i], value, places=6)
+
+    def test_optimal_execution_schedule(self):
+        """
+        Test the execution schedule and that memoized results are not shared.
+        """
+        model = AlmgrenChrissModel(risk_aversion=0.01)
+
+        times, trade_sizes = model.calculate_optimal_execution_schedule(1000, 4.0, 0.5)
+        self.assertEqual(len(times), len(trade_sizes))
+        self.assertAlmostEqual(np.sum(trade_sizes), 1000, places=6)
+
+        # Front-loaded for a risk-averse trader
+        self.assertGreater(trade_sizes[0], trade_sizes[-2])
+
+        # Modifying a result must not affect later calls
+        trade_sizes[:] = 0
+        _, trade_sizes = model.calculate_optimal_execution_schedule(1000, 4.0, 0.5)
+        self.assertAlmostEqual(np.sum(trade_sizes), 1000, places=6)
+
+        # Changing the model parameters changes the schedule
+        model.risk_aversion = 0.0
+        _, linear_sizes = model.calculate_optimal_execution_schedule(1000, 4.0, 0.5)
+        self.assertAlmostEqual(linear_sizes[0], linear_sizes[1], places=6)
+
+        # An explicit risk aversion overrides the model's without changing it
+        _, averse_sizes = model.calculate_optimal_execution_schedule(1000, 4.0, 0.5, risk_aversion=0.01)
+        np.testing.assert_allclose(averse_sizes, trade_sizes)
+        self.assertEqual(model.risk_aversion, 0.0)
+
+        # Small orders and fractional horizons are scheduled exactly, not rounded
+        times, small_sizes = model.calculate_optimal_execution_schedule(4e-7, 0.12345678, 0.5, risk_aversion=0.01)
+        self.assertEqual(times[-1], 0.12345678)
+        self.assertAlmostEqual(np.sum(small_sizes) / 4e-7, 1.0, places=12)
+        _, small_sizes = model.calculate_optimal_execution_schedule(0.00012345, 4.0, 0.5)
+        self.assertAlmostEqual(np.sum(small_sizes) / 0.00012345, 1.0, places=12)
+
+    def test_maker_taker_model_fitted(self):
+        """
+        Test that single-order estimates match the fitted sklearn model.
+        """
+        rng = np.random.default_rng(42)
+        X = rng.normal(size=(200, 4)) * [10.0, 0.5, 0.02, 0.3] + [5.0, 1.0, 0.01, 0.0]
+        y = (X[:, 1] - 0.1 * X[:, 0] + rng.normal(size=200) > 0).astype(int)
+
+        model = MakerTakerModel()
+        model.fit(X, y)
+
+        expected = model.predict_proba(X[:5])
+        for row, proba in zip(X[:5], expected):
+            self.assertAlmostEqual(model.estimate_maker_proportion(*row), proba)
+
+        # Extreme inputs saturate instead of overflowing
+        for order_size in (-1e6, 1e6):
+            proportion = model.estimate_maker_proportion(order_size, 1.0, 0.01, 0.0)
+            self.assertGreaterEqual(proportion, 0.0)
+            self.assertLessEqual(proportion, 1.0)
+
+    def test_model_pickling(self):
+        """
+        Test that fitted models survive pickling, including legacy pickles with a scaler.
+        """
+        from sklearn.preprocessing import StandardScaler
+
+        rng = np.random.default_rng(7)
+        X = rng.normal(size=(100, 4)) + [5.0, 1.0, 0.01, 0.0]
+        y = (X[:, 1] - X[:, 0] + 4.0 > 0).astype(int)
+
+        model = MakerTakerModel()
+        model.fit(X, y)
+        restored = pickle.loads(pickle.dumps(model))
+        self.assertAlmostEqual(restored.estimate_maker_proportion(*X[0]),
+                               model.estimate_maker_proportion(*X[0]))
+
+        slippage_model = SlippageModel()
+        slippage_model.fit(X, X[:, 0] * 0.1)
+        restored = pickle.loads(pickle.dumps(slippage_model))
+        self.assertAlmostEqual(restored.estimate_slippage(*X[0]), slippage_model.estimate_slippage(*X[0]))
+
+        # Legacy state: unfolded estimator plus its fitted scaler
+        scaler = StandardScaler().fit(X)
+        legacy = MakerTakerModel.__new__(MakerTakerModel)
+        legacy.__setstate__({'model': model.model, 'scaler': scaler, 'is_fitted': True})
+        expected = model.model.predict_proba(scaler.transform(X[:1]))[0, 1]
+        self.assertAlmostEqual(legacy.estimate_maker_proportion(*X[0]), expected)
+
+    def test_slippage_model_fitted(self):
+        """
+        Test that single-order estimates match the fitted sklearn models.
+        """
+        rng = np.random.default_rng(7)
+        X = rng.normal(size=(200, 4)) * [10.0, 0.5, 0.02, 0.3] + [5.0, 1.0, 0.01, 0.0]
+        y = 0.3 * X[:, 1] + 0.01 * X[:, 0] + 2.0 * X[:, 2] + rng.normal(scale=0.01, size=200)
+
+        for regression_type in ('linear', 'quantile'):
+            model = SlippageModel(regression_type=regression_type)
+            model.fit(X, y)
+
+            expected = model.predict(X[:5])
+            for row, slippage in zip(X[:5], expected):
+                self.assertAlmostEqual(model.estimate_slippage(*row), slippage)
+
+    def test_fallback_batch_estimates(self):
+        """
+        Test that batch fallback estimates match the per-order heuristics.
+        """
+        order_sizes = np.array([0.1, 1.0, 10.0])
+        slippage_model = SlippageModel()
+        maker_taker_model = MakerTakerModel()
+
+        slippages = slippage_model.estimate_slippage_batch(order_sizes, 1.0, 0.01, -0.05)
+        proportions = maker_taker_model.estimate_maker_proportion_batch(order_sizes, 1.0, 0.01, -0.05)
+
+        for i, size in enumerate(order_sizes):
+            self.assertAlmostEqual(slippages[i], slippage_model.estimate_slippage(size, 1.0, 0.01, -0.05))
+            self.assertAlmostEqual(proportions[i],
+                                   maker_taker_model.estimate_maker_proportion(size, 1.0, 0.01, -0.05))
+
+    def test_fee_model(self):
+        """
+        Test fee lookups, including fallbacks for unknown keys.
+        """
+        fee_model = FeeModel()
+
+        # Known keys
+        self.assertAlmostEqual(fee_model.get_fee_rate('OKX', 'futures', 'VIP3', True), -0.0001)
+        self.assertAlmostEqual(fee_model.get_fee_rate('OKX', 'spot', 'VIP1', False), 0.0010)
+
+        # Unknown exchange, market type, and fee tier fall back to OKX spot VIP0
+        self.assertAlmostEqual(fee_model.get_fee_rate('FOO', 'options', 'VIP9', True), 0.0010)
+
+        fees = fee_model.calculate_fee(1000.0, 'OKX', 'spot', 'VIP0', 0.25)
+        self.assertAlmostEqual(fees['maker_fee'], 250.0 * 0.0010)
+        self.assertAlmostEqual(fees['taker_fee'], 750.0 * 0.0015)
+        self.assertAlmostEqual(fees['effective_rate_pct'], fees['effective_rate'] * 100)
+
+        # Newly added exchanges are visible to lookups
+        fee_model.add_exchange_fee_tiers('BAR', {
+            'spot': {'maker': {'VIP0': 0.0002}, 'taker': {'VIP0': 0.0004}}
+        })
+        fees = fee_model.calculate_fee(1000.0, 'BAR', 'spot', 'VIP0', 0.5)
+        self.assertAlmostEqual(fees['total_fee'], 500.0 * 0.0002 + 500.0 * 0.0004)
+        
 if __name__ == '__main__':
     unittest.main()
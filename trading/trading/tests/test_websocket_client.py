@@ -0,0 +1,173 @@
+"""
+Tests for the WebSocket client against a local WebSocket server.
+"""
+import asyncio
+import json
+import threading
+import unittest
+import sys
+import os
+from unittest import mock
+
+import websockets
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import websocket_client
+from src.data.websocket_client import WebSocketClient, OrderbookWebSocketClient
+
+def orderbook_message(seq: int) -> str:
+    """
+    Build an orderbook message whose timestamp carries a sequence number.
+
+    Args:
+        seq: Sequence number
+
+    Returns:
+        str: JSON message
+    """
+    return json.dumps({
+        'timestamp': str(seq),
+        'exchange': 'OKX',
+        'symbol': 'BTC-USDT-SWAP',
+        'asks': [['45000.5', '1.5']],
+        'bids': [['44999.5', '1.0']]
+    })
+
+class SignallingOrderbookClient(OrderbookWebSocketClient):
+    """
+    Orderbook client that signals when the end of the stream has been queued.
+    """
+    __slots__ = ('stream_ended',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stream_ended = threading.Event()
+
+    async def _enqueue(self, queue, message):
+        await super()._enqueue(queue, message)
+        if message is None:
+            self.stream_ended.set()
+
+class TestWebSocketClient(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests for the WebSocket client.
+    """
+    async def serve_then_close(self, client: WebSocketClient, messages):
+        """
+        Serve the messages to the client, then close the stream and stop the client.
+
+        Args:
+            client: Client under test
+            messages: Messages to send
+
+        Returns:
+            Server listening on a free local port
+        """
+        async def handler(websocket):
+            try:
+                for message in messages:
+                    await websocket.send(message)
+            finally:
+                # Stop reconnecting once this stream ends
+                client.disconnect()
+
+        server = await websockets.serve(handler, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client.uri = f'ws://127.0.0.1:{port}'
+        return server
+
+    async def test_messages_in_order(self):
+        """
+        Test that every message reaches the callback in order and the client stops cleanly.
+        """
+        received = []
+        client = WebSocketClient('', lambda data: received.append(data['seq']), reconnect_interval=0)
+        server = await self.serve_then_close(client, [json.dumps({'seq': i}) for i in range(500)])
+
+        async with server:
+            await asyncio.wait_for(client.connect(), timeout=10)
+
+        # connect() returns only after the callbacks for received messages finished
+        self.assertEqual(received, list(range(500)))
+        self.assertFalse(client.running)
+        self.assertFalse(client.is_connected())
+        self.assertGreater(client.get_last_message_time(), 0)
+
+    async def test_orderbook_client_drops_oldest(self):
+        """
+        Test that the orderbook client drops the oldest messages when processing falls behind.
+        """
+        received = []
+
+        def callback(data):
+            # Hold the worker until every message has been received
+            client.stream_ended.wait(timeout=10)
+            received.append(int(data['timestamp']))
+
+        client = SignallingOrderbookClient('', callback, reconnect_interval=0)
+        client.max_queue_size = 4
+        client.max_pending_callbacks = 1
+
+        n_messages = 200
+        server = await self.serve_then_close(client, [orderbook_message(i) for i in range(n_messages)])
+
+        async with server:
+            await asyncio.wait_for(client.connect(), timeout=10)
+
+        self.assertGreater(client.dropped_messages, 0)
+        self.assertEqual(len(received) + client.dropped_messages, n_messages)
+        # Survivors keep their order and the newest message is never dropped
+        self.assertEqual(received, sorted(received))
+        self.assertEqual(received[-1], n_messages - 1)
+
+    async def test_base_client_does_not_drop(self):
+        """
+        Test that the generic client waits for queue space instead of dropping messages.
+        """
+        received = []
+        client = WebSocketClient('', lambda data: received.append(data['seq']), reconnect_interval=0)
+        client.max_queue_size = 2
+        client.max_pending_callbacks = 1
+        server = await self.serve_then_close(client, [json.dumps({'seq': i}) for i in range(100)])
+
+        async with server:
+            await asyncio.wait_for(client.connect(), timeout=10)
+
+        self.assertEqual(received, list(range(100)))
+
+    async def test_consumer_failure_does_not_hang(self):
+        """
+        Test that the client stops receiving when message processing fails.
+        """
+        received = []
+        client = WebSocketClient('', lambda data: received.append(data['seq']), reconnect_interval=0)
+        client.max_queue_size = 2
+        # Dispatching to a shut-down executor raises in the consumer
+        client._executor.shutdown()
+        server = await self.serve_then_close(client, [json.dumps({'seq': i}) for i in range(10)])
+
+        async with server:
+            await asyncio.wait_for(client.connect(), timeout=10)
+
+        self.assertEqual(received, [])
+        self.assertFalse(client.running)
+
+    async def test_invalid_utf8_skipped(self):
+        """
+        Test that frames which are not valid UTF-8 are skipped with the stdlib JSON parser.
+        """
+        received = []
+        client = WebSocketClient('', lambda data: received.append(data['seq']), reconnect_interval=0)
+        messages = [json.dumps({'seq': 0}), b'{"seq": "\x80"}', json.dumps({'seq': 1})]
+        server = await self.serve_then_close(client, messages)
+
+        with mock.patch.object(websocket_client, '_json', json):
+            async with server:
+                await asyncio.wait_for(client.connect(), timeout=10)
+
+        self.assertEqual(received, [0, 1])
+
+if __name__ == '__main__':
+    unittest.main()